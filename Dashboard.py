@@ -6,21 +6,21 @@ import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import os
 import time
-import random
 import warnings
+from random_streams import RandomStreams
+from chart_payload import line_figure, figure_payload_bytes
+from creators_aggregates import (aggregate_directory, aggregate_frames, chunk_files, chunks_signature, read_manifest,
+                                 write_manifest, CHUNK_FILE_PATTERN, MANIFEST_FILE)
+from platform_registry import PlatformRegistry
+from timeseries_store import TimeSeriesStore, LEVEL_LABELS, PANDAS_FREQ, PERIODS_PER_MONTH
 warnings.filterwarnings('ignore')
 
-# Configuration de la page
-st.set_page_config(
-    page_title="Analyse des Plateformes de Contenu Adulte - Live",
-    page_icon="💎",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
-
 # CSS personnalisé
-st.markdown("""
+PAGE_CSS = """
 <style>
     .main-header {
         font-size: 2.5rem;
@@ -75,17 +75,149 @@ st.markdown("""
         border-left: 4px solid #FF416C;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+def configure_page():
+    """Configure la page Streamlit (titre, mise en page et CSS)"""
+    # Configuration de la page
+    st.set_page_config(
+        page_title="Analyse des Plateformes de Contenu Adulte - Live",
+        page_icon="💎",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
+    
+    # CSS personnalisé
+    st.markdown(PAGE_CSS, unsafe_allow_html=True)
+
+
+# Génération des créateurs par blocs de taille fixe : le découpage ne dépend pas
+# du nombre de processus, ce qui garantit des résultats identiques en parallèle
+CREATORS_BLOCK_SIZE = 10000
+CREATOR_CATEGORIES = ['Fitness', 'Cosplay', 'Lifestyle', 'Adult', 'Gaming', 'Art', 'Music', 'Education']
+CREATOR_COUNTRIES = ['USA', 'UK', 'Canada', 'Australia', 'Germany', 'France', 'Brazil', 'Japan']
+
+# Largeur de référence d'un graphique (en pixels) pour le choix de la granularité
+CHART_WIDTH_PX = 800
+
+# Fourchettes (min, max) des scores de risque simulés
+RISK_RANGES = {
+    'Réglementaire': (0.3, 0.9),
+    'Concurrentiel': (0.2, 0.8),
+    'Technologique': (0.1, 0.6),
+    'Réputation': (0.4, 0.9),
+    'Dépendance Créateurs': (0.3, 0.8)
+}
+
+# Multiplicateurs de revenus (min, max) par catégorie
+EARNINGS_MULTIPLIERS = {'Adult': (1.5, 4.0), 'Fitness': (1.2, 2.5)}
+DEFAULT_EARNINGS_MULTIPLIER = (0.8, 2.0)
+
+
+def generate_creators_block(platforms, streams, start, stop, reference_time):
+    """Génère les créateurs d'identifiants start+1 à stop avec le flux du bloc"""
+    rng = streams.generator('creators', start // CREATORS_BLOCK_SIZE)
+    n = stop - start
+    
+    category_bounds = np.array([EARNINGS_MULTIPLIERS.get(c, DEFAULT_EARNINGS_MULTIPLIER) for c in CREATOR_CATEGORIES])
+    
+    platform_idx = rng.integers(len(platforms), size=n)
+    category_idx = rng.integers(len(CREATOR_CATEGORIES), size=n)
+    country_idx = rng.integers(len(CREATOR_COUNTRIES), size=n)
+    
+    # Revenus basés sur la plateforme et la catégorie
+    earnings_multiplier = rng.uniform(category_bounds[category_idx, 0], category_bounds[category_idx, 1])
+    
+    ids = np.arange(start + 1, stop + 1)
+    return pd.DataFrame({
+        'id': ids,
+        'username': [f'creator_{i}' for i in ids],
+        'platform': platforms.categorical(platform_idx),
+        'platform_code': platform_idx,
+        'category': np.array(CREATOR_CATEGORIES, dtype=object)[category_idx],
+        'country': np.array(CREATOR_COUNTRIES, dtype=object)[country_idx],
+        'monthly_earnings': platforms.avg_creator_earnings[platform_idx] * earnings_multiplier,
+        'followers': rng.integers(1000, 500001, size=n),
+        'subscription_price': rng.integers(5, 51, size=n),
+        'engagement_rate': rng.uniform(2, 15, size=n),
+        'content_quality': rng.uniform(3, 5, size=n),
+        'active_since': reference_time - pd.to_timedelta(rng.integers(30, 1001, size=n), unit='D')
+    })
+
+
+def write_creators_chunk(path, platforms, streams, start, stop, reference_time):
+    """Génère les créateurs start+1 à stop bloc par bloc et les écrit dans un morceau sur disque"""
+    frames = [
+        generate_creators_block(platforms, streams, block_start,
+                                min(block_start + CREATORS_BLOCK_SIZE, stop), reference_time)
+        for block_start in range(start, stop, CREATORS_BLOCK_SIZE)
+    ]
+    pd.concat(frames, ignore_index=True).to_pickle(path)
+    return path
+
+
+def simulate_live_block(streams, block_index, earnings, followers, engagement_rate):
+    """Applique une mise à jour live aléatoire à un bloc de créateurs"""
+    rng = streams.generator(block_index)
+    n = len(earnings)
+    
+    variation = rng.normal(0, 0.1, size=n)
+    earnings = earnings * (1 + variation)
+    followers = followers + rng.integers(-50, 101, size=n)
+    engagement_rate = np.clip(engagement_rate + rng.uniform(-0.5, 0.5, size=n), 0, 20)
+    return earnings, followers, engagement_rate
+
+
+@st.cache_resource
+def aggregation_pool(workers):
+    """Pool de processus d'agrégation partagé par toutes les sessions et réexécutions"""
+    # Processus démarrés par 'spawn' : le serveur Streamlit multi-thread n'est pas dupliqué par fork
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+
+
+@st.cache_data(max_entries=8, show_spinner="Agrégation de la population de créateurs...")
+def directory_aggregates(directory, signature, workers=1):
+    """Agrégats d'un dossier de morceaux, recalculés seulement quand ses fichiers changent"""
+    # signature (noms, tailles, dates des fichiers) ne sert que de clé de cache
+    return aggregate_directory(directory, workers=workers, executor=aggregation_pool(workers))
+
 
 class AdultPlatformsDashboard:
-    def __init__(self):
-        self.platforms = self.define_platforms()
-        self.creators_data = self.initialize_creators_data()
-        self.market_data = self.initialize_market_data()
+    def __init__(self, seed=None, n_creators=100, workers=1, market_freq='M', platforms_file=None,
+                 creators_dir=None, reference_date=None, live_tick=0):
+        self.streams = RandomStreams(seed)
+        # Date de référence (minuit) : avec la graine, elle fixe entièrement les données générées
+        self.reference_time = pd.Timestamp(reference_date or datetime.now()).normalize().to_pydatetime()
+        self.n_creators = n_creators
+        self.workers = workers
+        # Numéro de la prochaine mise à jour live (conservé entre les réexécutions Streamlit)
+        self.live_tick = live_tick
+        self.platforms = self.define_platforms(platforms_file)
+        
+        # Mode hors mémoire : les créateurs restent sur disque, en morceaux, dans creators_dir
+        self.creators_dir = creators_dir
+        self.creators_data = None if creators_dir else self.initialize_creators_data(workers)
+        self._creator_aggregates = None
+        
+        # Séries de marché à haute résolution et leurs agrégats, vue mensuelle pour les instantanés
+        self.market_store = TimeSeriesStore(self.initialize_market_data(market_freq), market_freq,
+                                            entities=self.platforms.names)
+        self.market_data = self.market_store.frame('M')
+        
+        # Plage temporelle visible et largeur des graphiques (choix de la granularité)
+        self.visible_range = (None, None)
+        self.chart_width_px = CHART_WIDTH_PX
+        
+        # Volume des graphiques envoyés au navigateur pendant l'exécution courante
+        self.payload_bytes = 0
+        self.payload_charts = 0
         
-    def define_platforms(self):
+    def define_platforms(self, platforms_file=None):
         """Définit les plateformes et leurs caractéristiques"""
-        return {
+        if platforms_file:
+            return PlatformRegistry.from_file(platforms_file)
+        
+        return PlatformRegistry.from_dict({
             'OnlyFans': {
                 'color': '#00A2FF',
                 'founded': 2016,
@@ -140,100 +272,133 @@ class AdultPlatformsDashboard:
                 'creators_count': 300000,
                 'avg_creator_earnings': 210
             }
-        }
+        })
     
-    def initialize_creators_data(self):
-        """Initialise les données des créateurs"""
-        categories = ['Fitness', 'Cosplay', 'Lifestyle', 'Adult', 'Gaming', 'Art', 'Music', 'Education']
-        countries = ['USA', 'UK', 'Canada', 'Australia', 'Germany', 'France', 'Brazil', 'Japan']
-        
-        creators = []
-        for i in range(100):
-            platform = random.choice(list(self.platforms.keys()))
-            category = random.choice(categories)
-            country = random.choice(countries)
-            
-            # Revenus basés sur la plateforme et la catégorie
-            base_earnings = self.platforms[platform]['avg_creator_earnings']
-            if category == 'Adult':
-                earnings_multiplier = random.uniform(1.5, 4.0)
-            elif category == 'Fitness':
-                earnings_multiplier = random.uniform(1.2, 2.5)
-            else:
-                earnings_multiplier = random.uniform(0.8, 2.0)
-            
-            monthly_earnings = base_earnings * earnings_multiplier
-            followers = random.randint(1000, 500000)
-            
-            creators.append({
-                'id': i + 1,
-                'username': f'creator_{i+1}',
-                'platform': platform,
-                'category': category,
-                'country': country,
-                'monthly_earnings': monthly_earnings,
-                'followers': followers,
-                'subscription_price': random.randint(5, 50),
-                'engagement_rate': random.uniform(2, 15),
-                'content_quality': random.uniform(3, 5),
-                'active_since': datetime.now() - timedelta(days=random.randint(30, 1000))
-            })
+    def initialize_creators_data(self, workers=1):
+        """Initialise les données des créateurs, bloc par bloc (éventuellement en parallèle)"""
+        blocks = [
+            (start, min(start + CREATORS_BLOCK_SIZE, self.n_creators))
+            for start in range(0, self.n_creators, CREATORS_BLOCK_SIZE)
+        ]
+        args = [(self.platforms, self.streams, start, stop, self.reference_time) for start, stop in blocks]
         
-        return pd.DataFrame(creators)
+        if workers > 1 and len(blocks) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                frames = list(executor.map(generate_creators_block, *zip(*args)))
+        else:
+            frames = [generate_creators_block(*block_args) for block_args in args]
+        
+        return pd.concat(frames, ignore_index=True)
     
-    def initialize_market_data(self):
-        """Initialise les données de marché historiques"""
-        dates = pd.date_range('2020-01-01', datetime.now(), freq='M')
-        data = []
-        
-        for date in dates:
-            for platform, info in self.platforms.items():
-                # Croissance basée sur l'âge de la plateforme
-                base_users = info['monthly_users']
-                base_creators = info['creators_count']
-                
-                # Facteur de croissance
-                months_since_founded = (date.year - info['founded']) * 12 + date.month
-                growth_factor = min(months_since_founded * 0.1, 3.0)
-                
-                # Variations aléatoires réalistes
-                user_variation = random.normalvariate(0, 0.05)
-                creator_variation = random.normalvariate(0, 0.03)
-                
-                monthly_users = base_users * growth_factor * (1 + user_variation)
-                creators_count = base_creators * growth_factor * (1 + creator_variation)
-                revenue = creators_count * info['avg_creator_earnings'] * 0.2  # 20% de frais
-                
-                data.append({
-                    'date': date,
-                    'platform': platform,
-                    'monthly_users': monthly_users,
-                    'creators_count': creators_count,
-                    'revenue_millions': revenue / 1000000,
-                    'market_share': 0  # À calculer plus tard
-                })
-        
-        df = pd.DataFrame(data)
-        
-        # Calcul de la part de marché
-        for date in df['date'].unique():
-            date_data = df[df['date'] == date]
-            total_revenue = date_data['revenue_millions'].sum()
-            df.loc[df['date'] == date, 'market_share'] = (
-                df[df['date'] == date]['revenue_millions'] / total_revenue * 100
-            )
+    def write_creators_chunks(self, n_creators, chunk_size=1000000, workers=1, overwrite=False):
+        """Génère une population de créateurs directement en morceaux sur disque"""
+        # Morceaux alignés sur les blocs pour rester identiques à la génération en mémoire
+        chunk_size = max(1, chunk_size // CREATORS_BLOCK_SIZE) * CREATORS_BLOCK_SIZE
+        os.makedirs(self.creators_dir, exist_ok=True)
+        
+        # D'anciens morceaux restés dans le dossier seraient agrégés avec la nouvelle population
+        existing = chunk_files(self.creators_dir)
+        if read_manifest(self.creators_dir) is not None:
+            existing.append(os.path.join(self.creators_dir, MANIFEST_FILE))
+        if existing and not overwrite:
+            raise FileExistsError(f"{self.creators_dir} contient déjà {len(existing)} fichiers de population "
+                                  f"(utiliser overwrite=True ou --overwrite pour les remplacer)")
+        for path in existing:
+            os.remove(path)
+        
+        args = [
+            (os.path.join(self.creators_dir, CHUNK_FILE_PATTERN.format(i)), self.platforms, self.streams,
+             start, min(start + chunk_size, n_creators), self.reference_time)
+            for i, start in enumerate(range(0, n_creators, chunk_size))
+        ]
         
-        return df
+        if workers > 1 and len(args) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                paths = list(executor.map(write_creators_chunk, *zip(*args)))
+        else:
+            paths = [write_creators_chunk(*chunk_args) for chunk_args in args]
+        
+        write_manifest(self.creators_dir, paths, n_creators, seed=self.streams.seed,
+                       reference_date=f"{self.reference_time:%Y-%m-%d}",
+                       platforms=list(self.platforms.names))
+        self.n_creators = n_creators
+        self._creator_aggregates = None
+        return paths
+    
+    def creator_aggregates(self):
+        """Agrégats des créateurs (moyennes, effectifs, top, corrélations), mis en cache"""
+        # En mémoire, le cache est invalidé à chaque mise à jour live ; hors mémoire, les
+        # agrégats sont partagés entre réexécutions tant que les fichiers ne changent pas
+        if self._creator_aggregates is None or self._creator_aggregates[0] != self.live_tick:
+            if self.creators_dir:
+                aggregates = directory_aggregates(self.creators_dir, chunks_signature(self.creators_dir),
+                                                  self.workers)
+            else:
+                aggregates = aggregate_frames([self.creators_data])
+            self._creator_aggregates = (self.live_tick, aggregates)
+        return self._creator_aggregates[1]
     
-    def update_live_data(self):
+    def initialize_market_data(self, freq='M'):
+        """Initialise les données de marché historiques à la granularité demandée"""
+        # Historique arrêté au dernier mois complet
+        end = pd.Timestamp(self.reference_time).to_period('M').start_time
+        dates = pd.date_range('2020-01-01', end, freq=PANDAS_FREQ[freq], inclusive='left')
+        registry = self.platforms
+        
+        # Croissance basée sur l'âge de la plateforme (dates x plateformes)
+        months_since_founded = ((dates.year.values[:, None] - registry.founded[None, :]) * 12
+                                + dates.month.values[:, None])
+        growth_factor = np.minimum(months_since_founded * 0.1, 3.0)
+        
+        # Variations aléatoires réalistes, un flux par plateforme
+        user_variation = np.empty(growth_factor.shape)
+        creator_variation = np.empty(growth_factor.shape)
+        for code, platform in enumerate(registry.names):
+            rng = self.streams.generator('market', platform)
+            user_variation[:, code] = rng.normal(0, 0.05, len(dates))
+            creator_variation[:, code] = rng.normal(0, 0.03, len(dates))
+        
+        monthly_users = registry.monthly_users * growth_factor * (1 + user_variation)
+        creators_count = registry.creators_count * growth_factor * (1 + creator_variation)
+        revenue = creators_count * registry.avg_creator_earnings * 0.2  # 20% de frais
+        revenue /= PERIODS_PER_MONTH[freq]  # Revenu de la période
+        
+        # La part de marché est calculée par le TimeSeriesStore à chaque granularité
+        return pd.DataFrame({
+            'date': np.repeat(dates.values, len(registry)),
+            'platform': np.tile(registry.names, len(dates)),
+            'monthly_users': monthly_users.ravel(),
+            'creators_count': creators_count.ravel(),
+            'revenue_millions': revenue.ravel() / 1000000
+        })
+    
+    def update_live_data(self, workers=1):
         """Met à jour les données en temps réel"""
-        # Mise à jour aléatoire des revenus des créateurs
-        for idx in self.creators_data.index:
-            variation = random.normalvariate(0, 0.1)
-            self.creators_data.loc[idx, 'monthly_earnings'] *= (1 + variation)
-            self.creators_data.loc[idx, 'followers'] += random.randint(-50, 100)
-            self.creators_data.loc[idx, 'engagement_rate'] += random.uniform(-0.5, 0.5)
-            self.creators_data.loc[idx, 'engagement_rate'] = max(0, min(20, self.creators_data.loc[idx, 'engagement_rate']))
+        # Les populations hors mémoire ne sont pas simulées en direct
+        if self.creators_data is None:
+            return
+        
+        # Chaque mise à jour utilise ses propres flux, bloc par bloc de créateurs
+        tick_streams = self.streams.child('live', self.live_tick)
+        self.live_tick += 1
+        
+        columns = ['monthly_earnings', 'followers', 'engagement_rate']
+        bounds = range(0, len(self.creators_data), CREATORS_BLOCK_SIZE)
+        args = [
+            (tick_streams, start // CREATORS_BLOCK_SIZE,
+             *(self.creators_data[col].to_numpy()[start:start + CREATORS_BLOCK_SIZE] for col in columns))
+            for start in bounds
+        ]
+        
+        if workers > 1 and len(args) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(simulate_live_block, *zip(*args)))
+        else:
+            results = [simulate_live_block(*block_args) for block_args in args]
+        
+        if results:
+            for col, values in zip(columns, zip(*results)):
+                self.creators_data[col] = np.concatenate(values)
     
     def display_header(self):
         """Affiche l'en-tête du dashboard"""
@@ -248,6 +413,23 @@ class AdultPlatformsDashboard:
         
         current_time = datetime.now().strftime('%H:%M:%S')
         st.sidebar.markdown(f"**🕐 Dernière mise à jour: {current_time}**")
+        st.sidebar.caption(f"🎲 Graine aléatoire: {self.streams.seed} · "
+                           f"📅 Date de référence: {self.reference_time:%Y-%m-%d}")
+    
+    def plot(self, fig):
+        """Affiche un graphique en comptabilisant la taille de sa spécification"""
+        self.payload_bytes += figure_payload_bytes(fig)
+        self.payload_charts += 1
+        st.plotly_chart(fig, use_container_width=True)
+    
+    def market_overview_metrics(self):
+        """Calcule les métriques globales de la vue d'ensemble"""
+        return {
+            'total_revenue': self.market_data.groupby('platform')['revenue_millions'].last().sum(),
+            'total_creators': int(self.platforms.creators_count.sum()),
+            'total_users': int(self.platforms.monthly_users.sum()),
+            'avg_earnings': self.creator_aggregates()['mean_earnings']
+        }
     
     def display_market_overview(self):
         """Affiche la vue d'ensemble du marché"""
@@ -255,48 +437,134 @@ class AdultPlatformsDashboard:
                    unsafe_allow_html=True)
         
         # Calcul des métriques globales
-        total_revenue = self.market_data.groupby('platform')['revenue_millions'].last().sum()
-        total_creators = sum([info['creators_count'] for info in self.platforms.values()])
-        total_users = sum([info['monthly_users'] for info in self.platforms.values()])
-        avg_earnings = self.creators_data['monthly_earnings'].mean()
+        metrics = self.market_overview_metrics()
         
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
             st.metric(
                 "Revenus Mensuels Totaux",
-                f"${total_revenue:.0f}M",
+                f"${metrics['total_revenue']:.0f}M",
                 "+12.5% vs mois dernier"
             )
         
         with col2:
             st.metric(
                 "Créateurs Actifs",
-                f"{total_creators:,}",
+                f"{metrics['total_creators']:,}",
                 "+8.3% vs mois dernier"
             )
         
         with col3:
             st.metric(
                 "Utilisateurs Mensuels",
-                f"{total_users:,}",
+                f"{metrics['total_users']:,}",
                 "+15.2% vs mois dernier"
             )
         
         with col4:
             st.metric(
                 "Revenu Moyen/Créateur",
-                f"${avg_earnings:.0f}/mois",
+                f"${metrics['avg_earnings']:.0f}/mois",
                 "+5.7% vs mois dernier"
             )
     
+    def build_platform_comparison(self, only=None):
+        """Construit les graphiques et tableaux de la comparaison entre plateformes (ou la seule vue `only`)"""
+        color_map = self.platforms.color_map()
+        
+        # Dernières données disponibles
+        latest_data = self.market_data[self.market_data['date'] == self.market_data['date'].max()]
+        history, level = self.market_store.select(*self.visible_range, width_px=self.chart_width_px)
+        views = {}
+        
+        # Graphique des parts de marché
+        if only in (None, 'market_share'):
+            views['market_share'] = px.pie(latest_data, 
+                                           values='market_share', 
+                                           names='platform',
+                                           title='Part de Marché par Plateforme',
+                                           color='platform',
+                                           color_discrete_map=color_map)
+        
+        # Revenus par plateforme
+        if only in (None, 'revenue'):
+            fig = px.bar(latest_data, 
+                        x='platform', 
+                        y='revenue_millions',
+                        title='Revenus Mensuels par Plateforme (Millions $)',
+                        color='platform',
+                        color_discrete_map=color_map)
+            fig.update_layout(xaxis_title="", yaxis_title="Revenus ($ Millions)")
+            views['revenue'] = fig
+        
+        # Évolution des utilisateurs
+        if only in (None, 'users_history'):
+            views['users_history'] = line_figure(history, 
+                                                 x='date', 
+                                                 y='monthly_users',
+                                                 color='platform',
+                                                 title=f'Évolution des Utilisateurs Mensuels (par {LEVEL_LABELS[level]})',
+                                                 color_discrete_map=color_map,
+                                                 width_px=self.chart_width_px)
+        
+        # Utilisateurs actuels
+        if only in (None, 'users_current'):
+            fig = px.bar(latest_data, 
+                        x='platform', 
+                        y='monthly_users',
+                        title='Utilisateurs Mensuels Actuels',
+                        color='platform',
+                        color_discrete_map=color_map)
+            fig.update_layout(xaxis_title="", yaxis_title="Utilisateurs")
+            views['users_current'] = fig
+        
+        # Évolution des créateurs
+        if only in (None, 'creators_history'):
+            views['creators_history'] = line_figure(history, 
+                                                    x='date', 
+                                                    y='creators_count',
+                                                    color='platform',
+                                                    title=f'Évolution du Nombre de Créateurs (par {LEVEL_LABELS[level]})',
+                                                    color_discrete_map=color_map,
+                                                    width_px=self.chart_width_px)
+        
+        # Créateurs actuels
+        if only in (None, 'creators_current'):
+            fig = px.bar(latest_data, 
+                        x='platform', 
+                        y='creators_count',
+                        title='Nombre de Créateurs Actuels',
+                        color='platform',
+                        color_discrete_map=color_map)
+            fig.update_layout(xaxis_title="", yaxis_title="Créateurs")
+            views['creators_current'] = fig
+        
+        # Tableau détaillé des performances
+        if only in (None, 'performance_table'):
+            registry = self.platforms.frame()
+            latest = latest_data.set_index('platform_code').reindex(registry.index)
+            creator_earnings = self.creator_aggregates()['platform']['monthly_earnings'].reindex(registry.index)
+        
+            views['performance_table'] = pd.DataFrame({
+                'Plateforme': registry['platform'],
+                'Année de Lancement': registry['founded'].astype(int),
+                'Frais (%)': registry['fees'].map('{:g}'.format),
+                'Type de Contenu': registry['content_type'],
+                'Utilisateurs': latest['monthly_users'].map('{:,.0f}'.format),
+                'Créateurs': latest['creators_count'].map('{:,.0f}'.format),
+                'Revenus Mensuels': latest['revenue_millions'].map('${:.1f}M'.format),
+                'Part de Marché': latest['market_share'].map('{:.1f}%'.format),
+                'Revenu Moyen Créateur': creator_earnings.map('${:.0f}'.format)
+            }).reset_index(drop=True)
+        return views
+    
     def create_platform_comparison(self):
         """Crée la comparaison entre plateformes"""
         st.markdown('<h3 class="section-header">🏆 COMPARAISON DES PLATEFORMES</h3>', 
                    unsafe_allow_html=True)
         
-        # Dernières données disponibles
-        latest_data = self.market_data[self.market_data['date'] == self.market_data['date'].max()]
+        views = self.build_platform_comparison()
         
         tab1, tab2, tab3, tab4 = st.tabs(["Revenus & Part de Marché", "Utilisateurs", "Créateurs", "Performance Détail"])
         
@@ -304,188 +572,150 @@ class AdultPlatformsDashboard:
             col1, col2 = st.columns(2)
             
             with col1:
-                # Graphique des parts de marché
-                fig = px.pie(latest_data, 
-                            values='market_share', 
-                            names='platform',
-                            title='Part de Marché par Plateforme',
-                            color='platform',
-                            color_discrete_map={p: info['color'] for p, info in self.platforms.items()})
-                st.plotly_chart(fig, use_container_width=True)
+                self.plot(views['market_share'])
             
             with col2:
-                # Revenus par plateforme
-                fig = px.bar(latest_data, 
-                            x='platform', 
-                            y='revenue_millions',
-                            title='Revenus Mensuels par Plateforme (Millions $)',
-                            color='platform',
-                            color_discrete_map={p: info['color'] for p, info in self.platforms.items()})
-                fig.update_layout(xaxis_title="", yaxis_title="Revenus ($ Millions)")
-                st.plotly_chart(fig, use_container_width=True)
+                self.plot(views['revenue'])
         
         with tab2:
             col1, col2 = st.columns(2)
             
             with col1:
-                # Évolution des utilisateurs
-                fig = px.line(self.market_data, 
-                             x='date', 
-                             y='monthly_users',
-                             color='platform',
-                             title='Évolution des Utilisateurs Mensuels',
-                             color_discrete_map={p: info['color'] for p, info in self.platforms.items()})
-                st.plotly_chart(fig, use_container_width=True)
+                self.plot(views['users_history'])
             
             with col2:
-                # Utilisateurs actuels
-                fig = px.bar(latest_data, 
-                            x='platform', 
-                            y='monthly_users',
-                            title='Utilisateurs Mensuels Actuels',
-                            color='platform',
-                            color_discrete_map={p: info['color'] for p, info in self.platforms.items()})
-                fig.update_layout(xaxis_title="", yaxis_title="Utilisateurs")
-                st.plotly_chart(fig, use_container_width=True)
+                self.plot(views['users_current'])
         
         with tab3:
             col1, col2 = st.columns(2)
             
             with col1:
-                # Évolution des créateurs
-                fig = px.line(self.market_data, 
-                             x='date', 
-                             y='creators_count',
-                             color='platform',
-                             title='Évolution du Nombre de Créateurs',
-                             color_discrete_map={p: info['color'] for p, info in self.platforms.items()})
-                st.plotly_chart(fig, use_container_width=True)
+                self.plot(views['creators_history'])
             
             with col2:
-                # Créateurs actuels
-                fig = px.bar(latest_data, 
-                            x='platform', 
-                            y='creators_count',
-                            title='Nombre de Créateurs Actuels',
-                            color='platform',
-                            color_discrete_map={p: info['color'] for p, info in self.platforms.items()})
-                fig.update_layout(xaxis_title="", yaxis_title="Créateurs")
-                st.plotly_chart(fig, use_container_width=True)
+                self.plot(views['creators_current'])
         
         with tab4:
-            # Tableau détaillé des performances
-            platform_stats = []
-            for platform, info in self.platforms.items():
-                platform_data = latest_data[latest_data['platform'] == platform].iloc[0]
-                creator_data = self.creators_data[self.creators_data['platform'] == platform]
-                
-                platform_stats.append({
-                    'Plateforme': platform,
-                    'Année de Lancement': info['founded'],
-                    'Frais (%)': info['fees'],
-                    'Type de Contenu': info['content_type'],
-                    'Utilisateurs': f"{platform_data['monthly_users']:,.0f}",
-                    'Créateurs': f"{platform_data['creators_count']:,.0f}",
-                    'Revenus Mensuels': f"${platform_data['revenue_millions']:.1f}M",
-                    'Part de Marché': f"{platform_data['market_share']:.1f}%",
-                    'Revenu Moyen Créateur': f"${creator_data['monthly_earnings'].mean():.0f}"
-                })
-            
-            st.dataframe(pd.DataFrame(platform_stats), use_container_width=True)
+            st.dataframe(views['performance_table'], use_container_width=True)
+    
+    def build_creators_analysis(self, only=None):
+        """Construit les graphiques de l'analyse des créateurs (ou la seule vue `only`)"""
+        color_map = self.platforms.color_map()
+        views = {}
+        
+        aggregates = self.creator_aggregates()
+        
+        # Top 10 créateurs par revenus
+        if only in (None, 'top_earners'):
+            top_earners = aggregates['top_earners'].assign(
+                platform=lambda df: self.platforms.names[df['platform_code'].to_numpy()]
+            )
+            fig = px.bar(top_earners, 
+                        x='username', 
+                        y='monthly_earnings',
+                        color='platform',
+                        title='Top 10 Créateurs par Revenus Mensuels',
+                        color_discrete_map=color_map)
+            fig.update_layout(xaxis_title="Créateur", yaxis_title="Revenus Mensuels ($)")
+            views['top_earners'] = fig
+        
+        # Distribution des revenus (histogramme précalculé par classes)
+        if only in (None, 'earnings_distribution'):
+            histogram = aggregates['histogram']
+            fig = px.bar(x=(histogram['earnings_min'] + histogram['earnings_max']) / 2,
+                        y=histogram['count'],
+                        title='Distribution des Revenus des Créateurs',
+                        color_discrete_sequence=['#FF416C'])
+            fig.update_layout(xaxis_title="Revenus Mensuels ($)", yaxis_title="Nombre de Créateurs", bargap=0)
+            views['earnings_distribution'] = fig
+        
+        # Revenus moyens par catégorie
+        if only in (None, 'category_earnings'):
+            category_earnings = aggregates['category']['monthly_earnings'].reset_index()
+            views['category_earnings'] = px.bar(category_earnings, 
+                                                x='category', 
+                                                y='monthly_earnings',
+                                                title='Revenus Moyens par Catégorie de Contenu',
+                                                color='category')
+        
+        # Nombre de créateurs par catégorie
+        if only in (None, 'category_counts'):
+            category_counts = aggregates['category']['count'].sort_values(ascending=False).reset_index()
+            views['category_counts'] = px.pie(category_counts, 
+                                              values='count', 
+                                              names='category',
+                                              title='Répartition des Créateurs par Catégorie')
+        
+        # Répartition géographique
+        country_counts = aggregates['country']['count'].sort_values(ascending=False).reset_index()
+        
+        # Carte choroplèthe simplifiée
+        if only in (None, 'country_map'):
+            views['country_map'] = px.choropleth(country_counts,
+                                                 locations='country',
+                                                 locationmode='country names',
+                                                 color='count',
+                                                 title='Répartition Géographique des Créateurs',
+                                                 color_continuous_scale='Viridis')
+        
+        # Revenus moyens par pays
+        if only in (None, 'country_earnings'):
+            country_earnings = aggregates['country']['monthly_earnings'].reset_index()
+            views['country_earnings'] = px.bar(country_earnings, 
+                                               x='country', 
+                                               y='monthly_earnings',
+                                               title='Revenus Moyens par Pays',
+                                               color='monthly_earnings',
+                                               color_continuous_scale='Viridis')
+        
+        # Analyse des corrélations
+        if only in (None, 'correlations'):
+            corr_matrix = aggregates['correlation']
+        
+            views['correlations'] = px.imshow(corr_matrix,
+                                              title='Corrélations entre les Métriques de Performance',
+                                              color_continuous_scale='RdBu_r',
+                                              aspect='auto')
+        return views
     
     def create_creators_analysis(self):
         """Analyse des créateurs et de leurs performances"""
         st.markdown('<h3 class="section-header">👑 ANALYSE DES CRÉATEURS</h3>', 
                    unsafe_allow_html=True)
         
+        views = self.build_creators_analysis()
+        
         tab1, tab2, tab3, tab4 = st.tabs(["Top Performers", "Analyse par Catégorie", "Géographie", "Corrélations"])
         
         with tab1:
             col1, col2 = st.columns(2)
             
             with col1:
-                # Top 10 créateurs par revenus
-                top_earners = self.creators_data.nlargest(10, 'monthly_earnings')
-                fig = px.bar(top_earners, 
-                            x='username', 
-                            y='monthly_earnings',
-                            color='platform',
-                            title='Top 10 Créateurs par Revenus Mensuels',
-                            color_discrete_map={p: info['color'] for p, info in self.platforms.items()})
-                fig.update_layout(xaxis_title="Créateur", yaxis_title="Revenus Mensuels ($)")
-                st.plotly_chart(fig, use_container_width=True)
+                self.plot(views['top_earners'])
             
             with col2:
-                # Distribution des revenus
-                fig = px.histogram(self.creators_data, 
-                                  x='monthly_earnings',
-                                  nbins=50,
-                                  title='Distribution des Revenus des Créateurs',
-                                  color_discrete_sequence=['#FF416C'])
-                fig.update_layout(xaxis_title="Revenus Mensuels ($)", yaxis_title="Nombre de Créateurs")
-                st.plotly_chart(fig, use_container_width=True)
+                self.plot(views['earnings_distribution'])
         
         with tab2:
             col1, col2 = st.columns(2)
             
             with col1:
-                # Revenus moyens par catégorie
-                category_earnings = self.creators_data.groupby('category')['monthly_earnings'].mean().reset_index()
-                fig = px.bar(category_earnings, 
-                            x='category', 
-                            y='monthly_earnings',
-                            title='Revenus Moyens par Catégorie de Contenu',
-                            color='category')
-                st.plotly_chart(fig, use_container_width=True)
+                self.plot(views['category_earnings'])
             
             with col2:
-                # Nombre de créateurs par catégorie
-                category_counts = self.creators_data['category'].value_counts().reset_index()
-                category_counts.columns = ['category', 'count']
-                fig = px.pie(category_counts, 
-                            values='count', 
-                            names='category',
-                            title='Répartition des Créateurs par Catégorie')
-                st.plotly_chart(fig, use_container_width=True)
+                self.plot(views['category_counts'])
         
         with tab3:
             col1, col2 = st.columns(2)
             
             with col1:
-                # Répartition géographique
-                country_counts = self.creators_data['country'].value_counts().reset_index()
-                country_counts.columns = ['country', 'count']
-                
-                # Carte choroplèthe simplifiée
-                fig = px.choropleth(country_counts,
-                                   locations='country',
-                                   locationmode='country names',
-                                   color='count',
-                                   title='Répartition Géographique des Créateurs',
-                                   color_continuous_scale='Viridis')
-                st.plotly_chart(fig, use_container_width=True)
+                self.plot(views['country_map'])
             
             with col2:
-                # Revenus moyens par pays
-                country_earnings = self.creators_data.groupby('country')['monthly_earnings'].mean().reset_index()
-                fig = px.bar(country_earnings, 
-                            x='country', 
-                            y='monthly_earnings',
-                            title='Revenus Moyens par Pays',
-                            color='monthly_earnings',
-                            color_continuous_scale='Viridis')
-                st.plotly_chart(fig, use_container_width=True)
+                self.plot(views['country_earnings'])
         
         with tab4:
-            # Analyse des corrélations
-            corr_data = self.creators_data[['monthly_earnings', 'followers', 'engagement_rate', 'content_quality', 'subscription_price']]
-            corr_matrix = corr_data.corr()
-            
-            fig = px.imshow(corr_matrix,
-                           title='Corrélations entre les Métriques de Performance',
-                           color_continuous_scale='RdBu_r',
-                           aspect='auto')
-            st.plotly_chart(fig, use_container_width=True)
+            self.plot(views['correlations'])
             
             # Insights sur les corrélations
             st.markdown("""
@@ -496,115 +726,129 @@ class AdultPlatformsDashboard:
             - Prix d'Abonnement vs Revenus: Relation complexe
             """)
     
+    def build_growth_analysis(self, only=None):
+        """Construit les graphiques de l'analyse de croissance (ou la seule vue `only`)"""
+        color_map = self.platforms.color_map()
+        views = {}
+        
+        # Granularité adaptée à la plage visible
+        start, end = self.visible_range
+        level = self.market_store.choose_level(start, end, self.chart_width_px)
+        revenue = self.market_store.frame(level).pivot_table(
+            index='date', 
+            columns='platform', 
+            values='revenue_millions'
+        )
+        
+        # Croissance cumulée des revenus (cumul sur tout l'historique, puis plage visible)
+        if only in (None, 'cumulative_revenue'):
+            platform_growth = revenue.cumsum().loc[start:end]
+        
+            views['cumulative_revenue'] = line_figure(platform_growth.reset_index().melt(id_vars=['date'], 
+                                                                                         value_name='revenue_cumulative', 
+                                                                                         var_name='platform'),
+                                                      x='date', 
+                                                      y='revenue_cumulative',
+                                                      color='platform',
+                                                      title=f'Croissance Cumulative des Revenus par Plateforme (par {LEVEL_LABELS[level]})',
+                                                      color_discrete_map=color_map,
+                                                      width_px=self.chart_width_px)
+        
+        # Taux de croissance par période
+        if only in (None, 'growth_rate'):
+            period_growth = (revenue.pct_change() * 100).loc[start:end]
+        
+            fig = line_figure(period_growth.reset_index().melt(id_vars=['date'], 
+                                                             value_name='growth_rate', 
+                                                             var_name='platform'),
+                             x='date', 
+                             y='growth_rate',
+                             color='platform',
+                             title=f'Taux de Croissance des Revenus par {LEVEL_LABELS[level]} (%)',
+                             color_discrete_map=color_map,
+                             width_px=self.chart_width_px)
+            fig.add_hline(y=0, line_dash="dash", line_color="red")
+            views['growth_rate'] = fig
+        
+        # Simulation de projections
+        future_dates = pd.date_range(start=self.market_data['date'].max() + timedelta(days=30), 
+                                   periods=12, freq=PANDAS_FREQ['M'])
+        
+        names = self.platforms.names
+        latest = self.market_data[self.market_data['date'] == self.market_data['date'].max()]
+        
+        # Facteurs de croissance basés sur l'historique (2-8% de croissance mensuelle)
+        growth_rates = np.array([self.streams.generator('projections', name).uniform(0.02, 0.08) for name in names])
+        growth_factor = (1 + growth_rates[None, :]) ** np.arange(1, len(future_dates) + 1)[:, None]
+        
+        df_projection = pd.DataFrame({
+            'date': np.repeat(future_dates.values, len(names)),
+            'platform': np.tile(names, len(future_dates)),
+            'revenue_millions': (latest['revenue_millions'].to_numpy() * growth_factor).ravel(),
+            'monthly_users': (latest['monthly_users'].to_numpy() * growth_factor).ravel(),
+            'creators_count': (latest['creators_count'].to_numpy() * growth_factor).ravel(),
+            'type': 'Projection'
+        })
+        
+        # Combiner données historiques et projections
+        if only in (None, 'projections'):
+            historical = self.market_data.copy()
+            historical['type'] = 'Historique'
+            combined_data = pd.concat([historical, df_projection])
+        
+            views['projections'] = line_figure(combined_data, 
+                                               x='date', 
+                                               y='revenue_millions',
+                                               color='platform',
+                                               line_dash='type',
+                                               title='Projection des Revenus 2024-2025',
+                                               color_discrete_map=color_map,
+                                               width_px=self.chart_width_px)
+        
+        # Analyse saisonnière
+        if only in (None, 'seasonality'):
+            seasonal_data = (self.market_data
+                             .assign(month=self.market_data['date'].dt.month)
+                             .groupby(['platform', 'month'])['revenue_millions'].mean().reset_index())
+        
+            fig = line_figure(seasonal_data, 
+                             x='month', 
+                             y='revenue_millions',
+                             color='platform',
+                             title='Saisonnalité des Revenus (Moyenne Mensuelle)',
+                             color_discrete_map=color_map,
+                             width_px=self.chart_width_px)
+            fig.update_xaxes(tickvals=list(range(1, 13)), 
+                           ticktext=['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 
+                                   'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'])
+            views['seasonality'] = fig
+        return views
+    
     def create_growth_analysis(self):
         """Analyse de la croissance et des tendances"""
         st.markdown('<h3 class="section-header">📈 ANALYSE DE CROISSANCE</h3>', 
                    unsafe_allow_html=True)
         
+        views = self.build_growth_analysis()
+        
         tab1, tab2, tab3 = st.tabs(["Tendances Temporelles", "Projections", "Analyse Saisonnière"])
         
         with tab1:
             col1, col2 = st.columns(2)
             
             with col1:
-                # Croissance cumulée des revenus
-                platform_growth = self.market_data.pivot_table(
-                    index='date', 
-                    columns='platform', 
-                    values='revenue_millions'
-                ).cumsum()
-                
-                fig = px.line(platform_growth.reset_index().melt(id_vars=['date'], 
-                                                               value_name='revenue_cumulative', 
-                                                               var_name='platform'),
-                             x='date', 
-                             y='revenue_cumulative',
-                             color='platform',
-                             title='Croissance Cumulative des Revenus par Plateforme',
-                             color_discrete_map={p: info['color'] for p, info in self.platforms.items()})
-                st.plotly_chart(fig, use_container_width=True)
+                self.plot(views['cumulative_revenue'])
             
             with col2:
-                # Taux de croissance mensuel
-                monthly_growth = self.market_data.pivot_table(
-                    index='date', 
-                    columns='platform', 
-                    values='revenue_millions'
-                ).pct_change() * 100
-                
-                fig = px.line(monthly_growth.reset_index().melt(id_vars=['date'], 
-                                                              value_name='growth_rate', 
-                                                              var_name='platform'),
-                             x='date', 
-                             y='growth_rate',
-                             color='platform',
-                             title='Taux de Croissance Mensuel des Revenus (%)',
-                             color_discrete_map={p: info['color'] for p, info in self.platforms.items()})
-                fig.add_hline(y=0, line_dash="dash", line_color="red")
-                st.plotly_chart(fig, use_container_width=True)
+                self.plot(views['growth_rate'])
         
         with tab2:
             # Projections basées sur les tendances historiques
             st.subheader("Projections 2024-2025")
-            
-            # Simulation de projections
-            future_dates = pd.date_range(start=self.market_data['date'].max() + timedelta(days=30), 
-                                       periods=12, freq='M')
-            
-            projection_data = []
-            for platform, info in self.platforms.items():
-                current_data = self.market_data[self.market_data['platform'] == platform].iloc[-1]
-                base_revenue = current_data['revenue_millions']
-                base_users = current_data['monthly_users']
-                base_creators = current_data['creators_count']
-                
-                # Facteurs de croissance basés sur l'historique
-                growth_rate = random.uniform(0.02, 0.08)  # 2-8% de croissance mensuelle
-                
-                for i, date in enumerate(future_dates):
-                    growth_factor = (1 + growth_rate) ** (i + 1)
-                    projection_data.append({
-                        'date': date,
-                        'platform': platform,
-                        'revenue_millions': base_revenue * growth_factor,
-                        'monthly_users': base_users * growth_factor,
-                        'creators_count': base_creators * growth_factor,
-                        'type': 'Projection'
-                    })
-            
-            df_projection = pd.DataFrame(projection_data)
-            
-            # Combiner données historiques et projections
-            historical = self.market_data.copy()
-            historical['type'] = 'Historique'
-            combined_data = pd.concat([historical, df_projection])
-            
-            fig = px.line(combined_data, 
-                         x='date', 
-                         y='revenue_millions',
-                         color='platform',
-                         line_dash='type',
-                         title='Projection des Revenus 2024-2025',
-                         color_discrete_map={p: info['color'] for p, info in self.platforms.items()})
-            st.plotly_chart(fig, use_container_width=True)
+            self.plot(views['projections'])
         
         with tab3:
-            # Analyse saisonnière
-            self.market_data['month'] = self.market_data['date'].dt.month
-            self.market_data['year'] = self.market_data['date'].dt.year
-            
-            seasonal_data = self.market_data.groupby(['platform', 'month'])['revenue_millions'].mean().reset_index()
-            
-            fig = px.line(seasonal_data, 
-                         x='month', 
-                         y='revenue_millions',
-                         color='platform',
-                         title='Saisonnalité des Revenus (Moyenne Mensuelle)',
-                         color_discrete_map={p: info['color'] for p, info in self.platforms.items()})
-            fig.update_xaxes(tickvals=list(range(1, 13)), 
-                           ticktext=['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 
-                                   'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'])
-            st.plotly_chart(fig, use_container_width=True)
+            self.plot(views['seasonality'])
             
             st.markdown("""
             **🎯 Insights Saisonniers:**
@@ -613,43 +857,31 @@ class AdultPlatformsDashboard:
             - Baisse en Décembre (fêtes)
             """)
     
-    def create_risk_analysis(self):
-        """Analyse des risques et de la régulation"""
-        st.markdown('<h3 class="section-header">⚠️ ANALYSE DES RISQUES</h3>', 
-                   unsafe_allow_html=True)
+    def build_risk_analysis(self, only=None):
+        """Construit les graphiques de l'analyse des risques (ou la seule vue `only`)"""
+        views = {}
         
-        col1, col2 = st.columns(2)
+        # Risques par plateforme
+        if only in (None, 'platform_risks'):
+            names = self.platforms.names
+            lows, highs = np.array(list(RISK_RANGES.values())).T
+            scores = np.array([self.streams.generator('risk', name).uniform(lows, highs) for name in names])
         
-        with col1:
-            # Risques par plateforme
-            risk_data = []
-            for platform, info in self.platforms.items():
-                risks = {
-                    'Réglementaire': random.uniform(0.3, 0.9),
-                    'Concurrentiel': random.uniform(0.2, 0.8),
-                    'Technologique': random.uniform(0.1, 0.6),
-                    'Réputation': random.uniform(0.4, 0.9),
-                    'Dépendance Créateurs': random.uniform(0.3, 0.8)
-                }
-                for risk_type, score in risks.items():
-                    risk_data.append({
-                        'Plateforme': platform,
-                        'Type de Risque': risk_type,
-                        'Score': score
-                    })
-            
-            df_risk = pd.DataFrame(risk_data)
-            
-            fig = px.bar(df_risk, 
-                        x='Plateforme', 
-                        y='Score',
-                        color='Type de Risque',
-                        title='Analyse des Risques par Plateforme',
-                        barmode='group')
-            st.plotly_chart(fig, use_container_width=True)
+            df_risk = pd.DataFrame({
+                'Plateforme': np.repeat(names, len(RISK_RANGES)),
+                'Type de Risque': np.tile(list(RISK_RANGES), len(names)),
+                'Score': scores.ravel()
+            })
         
-        with col2:
-            # Facteurs d'impact réglementaire
+            views['platform_risks'] = px.bar(df_risk, 
+                                             x='Plateforme', 
+                                             y='Score',
+                                             color='Type de Risque',
+                                             title='Analyse des Risques par Plateforme',
+                                             barmode='group')
+        
+        # Facteurs d'impact réglementaire
+        if only in (None, 'regulation_factors'):
             regulation_factors = {
                 'Conformité Légale': 0.85,
                 'Paiements & Banques': 0.78,
@@ -658,14 +890,29 @@ class AdultPlatformsDashboard:
                 'Fiscalité': 0.65,
                 'Droits Auteurs': 0.58
             }
-            
-            fig = px.bar(x=list(regulation_factors.values()), 
-                        y=list(regulation_factors.keys()),
-                        orientation='h',
-                        title='Facteurs d\'Impact Réglementaire',
-                        color=list(regulation_factors.values()),
-                        color_continuous_scale='Viridis')
-            st.plotly_chart(fig, use_container_width=True)
+        
+            views['regulation_factors'] = px.bar(x=list(regulation_factors.values()), 
+                                                 y=list(regulation_factors.keys()),
+                                                 orientation='h',
+                                                 title='Facteurs d\'Impact Réglementaire',
+                                                 color=list(regulation_factors.values()),
+                                                 color_continuous_scale='Viridis')
+        return views
+    
+    def create_risk_analysis(self):
+        """Analyse des risques et de la régulation"""
+        st.markdown('<h3 class="section-header">⚠️ ANALYSE DES RISQUES</h3>', 
+                   unsafe_allow_html=True)
+        
+        views = self.build_risk_analysis()
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            self.plot(views['platform_risks'])
+        
+        with col2:
+            self.plot(views['regulation_factors'])
     
     def create_sidebar(self):
         """Crée la sidebar avec les contrôles"""
@@ -675,45 +922,66 @@ class AdultPlatformsDashboard:
         st.sidebar.markdown("### 🔍 Filtres")
         selected_platforms = st.sidebar.multiselect(
             "Plateformes à afficher:",
-            list(self.platforms.keys()),
-            default=list(self.platforms.keys())[:3]
+            list(self.platforms.names),
+            default=list(self.platforms.names[:3]),
+            key='selected_platforms'
         )
         
         selected_categories = st.sidebar.multiselect(
             "Catégories de contenu:",
-            list(self.creators_data['category'].unique()),
-            default=list(self.creators_data['category'].unique())
+            list(self.creator_aggregates()['category'].index),
+            default=list(self.creator_aggregates()['category'].index),
+            key='selected_categories'
         )
         
         earnings_range = st.sidebar.slider(
             "Fourchette de revenus ($):",
             min_value=0,
-            max_value=int(self.creators_data['monthly_earnings'].max()),
-            value=(0, int(self.creators_data['monthly_earnings'].max()))
+            max_value=int(self.creator_aggregates()['earnings_max']),
+            value=(0, int(self.creator_aggregates()['earnings_max'])),
+            key='earnings_range'
         )
         
+        visible_range = st.sidebar.slider(
+            "Période affichée:",
+            min_value=self.market_store.start.to_pydatetime(),
+            max_value=self.market_store.end.to_pydatetime(),
+            value=(self.market_store.start.to_pydatetime(), self.market_store.end.to_pydatetime()),
+            format="YYYY-MM-DD",
+            key='visible_range'
+        )
+        self.visible_range = visible_range
+        
         # Options d'affichage
         st.sidebar.markdown("### ⚙️ Options")
-        auto_refresh = st.sidebar.checkbox("Rafraîchissement automatique", value=True)
-        show_projections = st.sidebar.checkbox("Afficher les projections", value=True)
+        auto_refresh = st.sidebar.checkbox("Rafraîchissement automatique",
+                                           value=os.environ.get('DASHBOARD_AUTO_REFRESH', '1') != '0',
+                                           key='auto_refresh')
+        show_projections = st.sidebar.checkbox("Afficher les projections", value=True, key='show_projections')
         
         # Bouton de rafraîchissement manuel
-        if st.sidebar.button("🔄 Rafraîchir les données"):
+        if st.sidebar.button("🔄 Rafraîchir les données", key='refresh_data'):
             self.update_live_data()
+            st.session_state['live_tick'] = self.live_tick
             st.rerun()
         
         return {
             'selected_platforms': selected_platforms,
             'selected_categories': selected_categories,
             'earnings_range': earnings_range,
+            'visible_range': visible_range,
             'auto_refresh': auto_refresh,
             'show_projections': show_projections
         }
 
     def run_dashboard(self):
         """Exécute le dashboard complet"""
-        # Mise à jour des données live
+        self.payload_bytes = 0
+        self.payload_charts = 0
+        
+        # Mise à jour des données live, avec le flux de la mise à jour suivante de la session
         self.update_live_data()
+        st.session_state['live_tick'] = self.live_tick
         
         # Sidebar
         controls = self.create_sidebar()
@@ -803,7 +1071,7 @@ class AdultPlatformsDashboard:
         
         with tab6:
             st.markdown("## 📊 À propos de ce dashboard")
-            st.markdown("""
+            st.markdown(f"""
             Ce dashboard présente une analyse en temps réel du marché des plateformes de contenu adulte 
             et de leurs créateurs.
             
@@ -813,7 +1081,7 @@ class AdultPlatformsDashboard:
             - Analyse multidimensionnelle (revenus, croissance, risques)
             
             **Plateformes suivies :**
-            - OnlyFans, MyM, Fansly, Patreon, JustForFans, LoyalFans
+            - {len(self.platforms)} plateformes : {', '.join(self.platforms.names[:6])}{'...' if len(self.platforms) > 6 else ''}
             - Analyse comparative des performances
             - Focus sur les dynamiques de croissance
             
@@ -823,6 +1091,9 @@ class AdultPlatformsDashboard:
             **🔒 Confidentialité:** Toutes les données des créateurs sont anonymisées et agrégées.
             """)
         
+        st.sidebar.caption(f"📦 Graphiques envoyés: {self.payload_charts} "
+                           f"({self.payload_bytes / 1024:,.0f} Ko par exécution)")
+        
         # Rafraîchissement automatique
         if controls['auto_refresh']:
             time.sleep(30)  # Rafraîchissement toutes les 30 secondes
@@ -830,5 +1101,12 @@ class AdultPlatformsDashboard:
 
 # Lancement du dashboard
 if __name__ == "__main__":
-    dashboard = AdultPlatformsDashboard()
+    configure_page()
+    dashboard = AdultPlatformsDashboard(seed=os.environ.get('DASHBOARD_SEED'),
+                                        market_freq=os.environ.get('DASHBOARD_MARKET_FREQ', 'M'),
+                                        platforms_file=os.environ.get('DASHBOARD_PLATFORMS_FILE'),
+                                        creators_dir=os.environ.get('DASHBOARD_CREATORS_DIR'),
+                                        workers=int(os.environ.get('DASHBOARD_WORKERS', 1)),
+                                        reference_date=os.environ.get('DASHBOARD_REFERENCE_DATE'),
+                                        live_tick=st.session_state.get('live_tick', 0))
     dashboard.run_dashboard()
\ No newline at end of file
@@ -0,0 +1,101 @@
+# chart_payload.py
+"""Graphiques compacts : sous-échantillonnage, traces WebGL et tableaux binaires.
+
+Les séries temporelles sont réduites à la largeur du graphique en pixels par
+l'algorithme LTTB (Largest-Triangle-Three-Buckets), qui conserve les pics et
+la forme des courbes. Les valeurs sont transmises en tableaux numpy : plotly
+(>= 6) les encode en tableaux typés base64 au lieu de listes JSON, et les
+dates sont envoyées en millisecondes depuis l'epoch (float64) plutôt qu'en
+chaînes ISO. Au-delà d'un certain nombre de points, les traces passent en
+WebGL (``Scattergl``).
+"""
+import numpy as np
+import plotly.graph_objects as go
+import plotly.io as pio
+
+# Nombre total de points au-delà duquel les traces sont rendues en WebGL
+WEBGL_POINT_THRESHOLD = 2000
+
+# Styles de trait successifs pour la dimension line_dash
+DASH_STYLES = ['solid', 'dash', 'dot', 'dashdot', 'longdash', 'longdashdot']
+
+
+def lttb_indices(x, y, n_out):
+    """Indices des points retenus par l'algorithme Largest-Triangle-Three-Buckets"""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # Premier et dernier points conservés, n_out - 2 seaux entre les deux
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    indices = np.empty(n_out, dtype=int)
+    indices[0], indices[-1] = 0, n - 1
+
+    previous = 0
+    for bucket in range(n_out - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        # Point moyen du seau suivant
+        next_stop = edges[bucket + 2] if bucket + 2 < len(edges) else n
+        next_x = x[stop:next_stop].mean()
+        next_y = y[stop:next_stop].mean()
+
+        # Point du seau courant formant le plus grand triangle
+        areas = np.abs(
+            (x[previous] - next_x) * (y[start:stop] - y[previous])
+            - (x[previous] - x[start:stop]) * (next_y - y[previous])
+        )
+        previous = start + int(np.argmax(areas))
+        indices[bucket + 1] = previous
+
+    return indices
+
+
+def to_plot_array(values):
+    """Convertit une colonne en tableau numérique compact (dates en ms depuis l'epoch)"""
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.datetime64):
+        return values.astype('datetime64[ms]').astype(np.float64), True
+    return values.astype(np.float64), False
+
+
+def line_figure(df, x, y, color, title, color_discrete_map=None, line_dash=None, width_px=800):
+    """Équivalent compact de ``px.line`` : une trace sous-échantillonnée par groupe"""
+    group_columns = [color] + ([line_dash] if line_dash else [])
+    dash_values = list(dict.fromkeys(df[line_dash])) if line_dash else []
+    color_discrete_map = color_discrete_map or {}
+
+    series = []
+    is_date = False
+    for keys, group in df.groupby(group_columns, sort=False, observed=True):
+        keys = keys if isinstance(keys, tuple) else (keys,)
+        group = group.sort_values(x)
+        x_values, is_date = to_plot_array(group[x])
+        y_values, _ = to_plot_array(group[y])
+
+        # Points manquants exclus (le calcul des triangles ne les supporte pas)
+        finite = np.isfinite(y_values)
+        x_values, y_values = x_values[finite], y_values[finite]
+        kept = lttb_indices(x_values, y_values, width_px)
+        series.append((keys, x_values[kept], y_values[kept]))
+
+    total_points = sum(len(x_values) for _, x_values, _ in series)
+    trace_class = go.Scattergl if total_points > WEBGL_POINT_THRESHOLD else go.Scatter
+
+    fig = go.Figure()
+    for keys, x_values, y_values in series:
+        name = ', '.join(str(key) for key in keys)
+        line = {'color': color_discrete_map.get(keys[0])}
+        if line_dash:
+            line['dash'] = DASH_STYLES[dash_values.index(keys[1]) % len(DASH_STYLES)]
+        fig.add_trace(trace_class(x=x_values, y=y_values, mode='lines', name=name,
+                                  legendgroup=str(keys[0]), line=line))
+
+    fig.update_layout(title=title, xaxis_title=x, yaxis_title=y, legend_title_text=color)
+    if is_date:
+        fig.update_xaxes(type='date')
+    return fig
+
+
+def figure_payload_bytes(fig):
+    """Taille (en octets) de la spécification JSON envoyée au navigateur"""
+    return len(pio.to_json(fig, validate=False).encode('utf-8'))
@@ -0,0 +1,274 @@
+# creators_aggregates.py
+"""Agrégations des données créateurs, en mémoire ou hors mémoire.
+
+Chaque morceau (chunk) de la table des créateurs est réduit à des agrégats
+partiels de taille fixe (sommes et effectifs par groupe, top-N, moments pour
+les corrélations, histogramme), qui sont ensuite combinés. La table
+complète n'est donc jamais chargée : en mode hors mémoire, les morceaux sont
+lus depuis le disque par un pool de processus et la mémoire maximale dépend
+de la taille d'un morceau, pas de la population.
+
+Génération d'une population sur disque :
+
+    python creators_aggregates.py generate dossier_createurs --creators 10000000 --workers 8
+"""
+import argparse
+import glob
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+# Colonnes utilisées par les agrégations
+CORRELATION_COLUMNS = ['monthly_earnings', 'followers', 'engagement_rate', 'content_quality', 'subscription_price']
+TOP_COLUMNS = ['username', 'platform_code', 'monthly_earnings']
+GROUP_COLUMNS = ['category', 'country', 'platform_code']
+AGGREGATION_COLUMNS = list(dict.fromkeys(GROUP_COLUMNS + TOP_COLUMNS + CORRELATION_COLUMNS))
+
+# Formats de morceaux reconnus
+CHUNK_EXTENSIONS = ('.pkl', '.parquet', '.csv')
+CHUNK_FILE_PATTERN = 'creators_{:06d}.pkl'
+
+# Description de la population écrite à côté des morceaux générés
+MANIFEST_FILE = 'manifest.json'
+
+
+def read_chunk(path):
+    """Lit un morceau de la table des créateurs (colonnes utiles uniquement)"""
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path, columns=AGGREGATION_COLUMNS)
+    if path.endswith('.csv'):
+        return pd.read_csv(path, usecols=AGGREGATION_COLUMNS)
+    return pd.read_pickle(path)[AGGREGATION_COLUMNS]
+
+
+def chunk_files(directory):
+    """Fichiers de morceaux présents dans un dossier, dans l'ordre"""
+    return sorted(
+        path for path in glob.glob(os.path.join(directory, '*'))
+        if path.endswith(CHUNK_EXTENSIONS)
+    )
+
+
+def write_manifest(directory, paths, n_creators, **info):
+    """Écrit le manifeste d'une population : effectif total et liste des morceaux"""
+    manifest = {
+        'n_creators': n_creators,
+        'chunks': [os.path.basename(path) for path in paths],
+        **info
+    }
+    with open(os.path.join(directory, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def read_manifest(directory):
+    """Lit le manifeste d'un dossier de morceaux (None si le dossier n'en a pas)"""
+    path = os.path.join(directory, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def chunks_signature(directory):
+    """Empreinte (nom, taille, date de modification) des fichiers d'une population, pour les caches"""
+    paths = chunk_files(directory)
+    if read_manifest(directory) is not None:
+        paths.append(os.path.join(directory, MANIFEST_FILE))
+    return tuple(
+        (os.path.basename(path), os.stat(path).st_size, os.stat(path).st_mtime_ns)
+        for path in paths
+    )
+
+
+def list_chunks(directory):
+    """Liste les morceaux d'un dossier : ceux du manifeste s'il existe, sinon tous"""
+    manifest = read_manifest(directory)
+    if manifest is None:
+        paths = chunk_files(directory)
+    else:
+        paths = [os.path.join(directory, name) for name in manifest['chunks']]
+        missing = [path for path in paths if not os.path.exists(path)]
+        if missing:
+            raise FileNotFoundError(f"Morceaux du manifeste introuvables: {', '.join(missing)}")
+    if not paths:
+        raise FileNotFoundError(f"Aucun morceau de données créateurs dans {directory}")
+    return paths
+
+
+def partial_aggregates(df, top_n=10):
+    """Réduit un morceau de données à ses agrégats partiels"""
+    earnings = df['monthly_earnings']
+    values = df[CORRELATION_COLUMNS].to_numpy(dtype=float)
+    mean = values.mean(axis=0) if len(values) else np.zeros(len(CORRELATION_COLUMNS))
+    centered = values - mean
+
+    return {
+        'groups': {
+            column: earnings.groupby(df[column].to_numpy()).agg(['sum', 'count'])
+            for column in GROUP_COLUMNS
+        },
+        'top': df.nlargest(top_n, 'monthly_earnings')[TOP_COLUMNS],
+        # Moments pour la corrélation : effectif, moyenne et co-moments centrés
+        'n': len(values),
+        'mean': mean,
+        'comoments': centered.T @ centered,
+        'earnings_min': earnings.min() if len(earnings) else np.inf,
+        'earnings_max': earnings.max() if len(earnings) else -np.inf
+    }
+
+
+def combine_aggregates(left, right, top_n=10):
+    """Combine deux agrégats partiels (opération associative)"""
+    n = left['n'] + right['n']
+    delta = right['mean'] - left['mean']
+    mean = left['mean'] + delta * (right['n'] / n) if n else left['mean']
+    comoments = left['comoments'] + right['comoments']
+    if n:
+        comoments = comoments + np.outer(delta, delta) * (left['n'] * right['n'] / n)
+
+    return {
+        'groups': {
+            column: left['groups'][column].add(right['groups'][column], fill_value=0)
+            for column in GROUP_COLUMNS
+        },
+        'top': pd.concat([left['top'], right['top']]).nlargest(top_n, 'monthly_earnings'),
+        'n': n,
+        'mean': mean,
+        'comoments': comoments,
+        'earnings_min': min(left['earnings_min'], right['earnings_min']),
+        'earnings_max': max(left['earnings_max'], right['earnings_max'])
+    }
+
+
+def histogram_counts(df, edges):
+    """Effectifs de l'histogramme des revenus d'un morceau"""
+    return np.histogram(df['monthly_earnings'].to_numpy(), bins=edges)[0]
+
+
+def _partial_from_file(path, top_n):
+    return partial_aggregates(read_chunk(path), top_n)
+
+
+def _histogram_from_file(path, edges):
+    return histogram_counts(read_chunk(path), edges)
+
+
+def finalize_aggregates(combined, histogram, edges):
+    """Transforme les agrégats combinés en tables prêtes à afficher"""
+    groups = {}
+    for column, sums in combined['groups'].items():
+        groups[column] = pd.DataFrame({
+            'monthly_earnings': sums['sum'] / sums['count'],
+            'count': sums['count'].astype(int)
+        }).rename_axis(column)
+
+    n = combined['n']
+    covariance = combined['comoments'] / (n - 1) if n > 1 else np.full_like(combined['comoments'], np.nan)
+    std = np.sqrt(np.diag(covariance))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        correlation = covariance / np.outer(std, std)
+
+    total_count = groups['category']['count'].sum()
+    return {
+        'n_creators': n,
+        'mean_earnings': (combined['groups']['category']['sum'].sum() / total_count) if total_count else np.nan,
+        'earnings_min': combined['earnings_min'],
+        'earnings_max': combined['earnings_max'],
+        'category': groups['category'],
+        'country': groups['country'],
+        'platform': groups['platform_code'],
+        'top_earners': combined['top'].reset_index(drop=True),
+        'correlation': pd.DataFrame(correlation, index=CORRELATION_COLUMNS, columns=CORRELATION_COLUMNS),
+        'histogram': pd.DataFrame({
+            'earnings_min': edges[:-1],
+            'earnings_max': edges[1:],
+            'count': histogram
+        })
+    }
+
+
+def _histogram_edges(combined, bins):
+    low, high = combined['earnings_min'], combined['earnings_max']
+    if not np.isfinite(low):
+        low, high = 0.0, 1.0
+    return np.linspace(low, high if high > low else low + 1, bins + 1)
+
+
+def aggregate_frames(frames, top_n=10, bins=50):
+    """Agrège des DataFrames déjà en mémoire (même calcul que le mode hors mémoire)"""
+    frames = list(frames)
+    combined = None
+    for df in frames:
+        part = partial_aggregates(df, top_n)
+        combined = part if combined is None else combine_aggregates(combined, part, top_n)
+
+    edges = _histogram_edges(combined, bins)
+    histogram = sum(histogram_counts(df, edges) for df in frames)
+    return finalize_aggregates(combined, histogram, edges)
+
+
+def aggregate_chunks(paths, top_n=10, bins=50, workers=None, executor=None):
+    """Agrège des morceaux sur disque en parallèle, sans charger la population entière.
+
+    Un pool de processus existant peut être fourni ; sinon un pool temporaire est créé.
+    """
+    if executor is None:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return aggregate_chunks(paths, top_n, bins, executor=executor)
+
+    # 1er passage : agrégats partiels combinés au fil de l'eau
+    combined = None
+    for part in executor.map(partial(_partial_from_file, top_n=top_n), paths):
+        combined = part if combined is None else combine_aggregates(combined, part, top_n)
+
+    # 2e passage : histogramme sur des classes communes à tous les morceaux
+    edges = _histogram_edges(combined, bins)
+    histogram = np.zeros(bins, dtype=np.int64)
+    for counts in executor.map(partial(_histogram_from_file, edges=edges), paths):
+        histogram += counts
+
+    return finalize_aggregates(combined, histogram, edges)
+
+
+def aggregate_directory(directory, top_n=10, bins=50, workers=None, executor=None):
+    """Agrège les morceaux d'un dossier en vérifiant l'effectif annoncé par le manifeste"""
+    aggregates = aggregate_chunks(list_chunks(directory), top_n, bins, workers, executor)
+    manifest = read_manifest(directory)
+    if manifest is not None and aggregates['n_creators'] != manifest['n_creators']:
+        raise ValueError(f"{directory}: {aggregates['n_creators']} créateurs lus, "
+                         f"{manifest['n_creators']} annoncés par le manifeste")
+    return aggregates
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Outils pour les données créateurs hors mémoire")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    generate = subparsers.add_parser('generate', help="Génère une population de créateurs en morceaux sur disque")
+    generate.add_argument('directory', help="Dossier de sortie des morceaux")
+    generate.add_argument('--creators', type=int, required=True, help="Nombre de créateurs")
+    generate.add_argument('--chunk-size', type=int, default=1000000, help="Créateurs par morceau")
+    generate.add_argument('--seed', type=int, default=None, help="Graine aléatoire racine")
+    generate.add_argument('--reference-date', default=None,
+                          help="Date de référence des données (AAAA-MM-JJ, aujourd'hui par défaut)")
+    generate.add_argument('--platforms-file', default=None, help="Définitions des plateformes (JSON ou CSV)")
+    generate.add_argument('--workers', '-w', type=int, default=os.cpu_count(), help="Nombre de processus")
+    generate.add_argument('--overwrite', action='store_true',
+                          help="Remplace les morceaux déjà présents dans le dossier")
+    args = parser.parse_args()
+
+    from Dashboard import AdultPlatformsDashboard
+    dashboard = AdultPlatformsDashboard(seed=args.seed, platforms_file=args.platforms_file,
+                                        creators_dir=args.directory, reference_date=args.reference_date)
+    paths = dashboard.write_creators_chunks(args.creators, args.chunk_size, args.workers, args.overwrite)
+    print(f"{len(paths)} morceaux écrits dans {args.directory} "
+          f"(graine {dashboard.streams.seed}, date de référence {dashboard.reference_time:%Y-%m-%d})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+# export_report.py
+"""Export statique (HTML autonome) de toutes les vues du dashboard.
+
+Usage :
+
+    python export_report.py --output rapport.html --workers 4
+"""
+import argparse
+import copy
+import html
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import pandas as pd
+from plotly.offline import get_plotlyjs
+
+from Dashboard import AdultPlatformsDashboard, PAGE_CSS
+
+# Sections exportées : (méthode de construction, titre, vues dans l'ordre du rapport)
+REPORT_SECTIONS = [
+    ('build_platform_comparison', '🏆 COMPARAISON DES PLATEFORMES',
+     ['market_share', 'revenue', 'users_history', 'users_current', 'creators_history', 'creators_current',
+      'performance_table']),
+    ('build_creators_analysis', '👑 ANALYSE DES CRÉATEURS',
+     ['top_earners', 'earnings_distribution', 'category_earnings', 'category_counts', 'country_map',
+      'country_earnings', 'correlations']),
+    ('build_growth_analysis', '📈 ANALYSE DE CROISSANCE',
+     ['cumulative_revenue', 'growth_rate', 'projections', 'seasonality']),
+    ('build_risk_analysis', '⚠️ ANALYSE DES RISQUES',
+     ['platform_risks', 'regulation_factors']),
+]
+
+# Types de traces dont le fond de carte est téléchargé à l'affichage
+GEO_TRACE_TYPES = ('choropleth', 'scattergeo')
+
+# Dashboard partagé par les processus de travail
+_worker_dashboard = None
+
+
+def _init_worker(dashboard):
+    """Installe le dashboard reçu du processus parent dans le worker"""
+    global _worker_dashboard
+    _worker_dashboard = dashboard
+
+
+def geo_table(fig):
+    """Données d'une carte géographique sous forme de tableau (lieu, valeur)"""
+    frames = [
+        pd.DataFrame({'Lieu': trace.locations, fig.layout.coloraxis.colorbar.title.text or 'Valeur': trace.z})
+        for trace in fig.data if trace.type in GEO_TRACE_TYPES
+    ]
+    return pd.concat(frames, ignore_index=True)
+
+
+def render_view(name, view):
+    """Convertit un graphique ou un tableau en fragment HTML"""
+    # Les cartes chargent leur fond (topojson) depuis le CDN de plotly : hors ligne,
+    # le rapport autonome affiche leurs données en tableau
+    if not isinstance(view, pd.DataFrame) and any(trace.type in GEO_TRACE_TYPES for trace in view.data):
+        title = html.escape(view.layout.title.text or '')
+        return f'<h4>{title}</h4>' + render_view(name, geo_table(view))
+    if isinstance(view, pd.DataFrame):
+        return view.to_html(index=False, classes='report-table', border=0)
+    # Plotly.js est embarqué une seule fois dans l'en-tête du rapport
+    return view.to_html(full_html=False, include_plotlyjs=False, div_id=name,
+                        config={'responsive': True})
+
+
+def render_section_view(builder, name):
+    """Construit une seule vue d'une section et la rend en HTML"""
+    view = getattr(_worker_dashboard, builder)(only=name)[name]
+    section = builder.replace('build_', '')
+    return render_view(f'{section}-{name}', view)
+
+
+def worker_dashboard(dashboard):
+    """Copie légère du dashboard pour les workers : agrégats des créateurs calculés, sans la population"""
+    # Agrégats calculés une fois ici (pool propre en mode hors mémoire), puis partagés
+    dashboard.creator_aggregates()
+    light = copy.copy(dashboard)
+    light.creators_data = None
+    return light
+
+
+def render_overview(dashboard):
+    """Rend les métriques globales de la vue d'ensemble"""
+    metrics = dashboard.market_overview_metrics()
+    cards = [
+        ("Revenus Mensuels Totaux", f"${metrics['total_revenue']:.0f}M"),
+        ("Créateurs Actifs", f"{metrics['total_creators']:,}"),
+        ("Utilisateurs Mensuels", f"{metrics['total_users']:,}"),
+        ("Revenu Moyen/Créateur", f"${metrics['avg_earnings']:.0f}/mois"),
+    ]
+    return ''.join(
+        f'<div class="metric-card"><small>{html.escape(label)}</small><br><b>{value}</b></div>'
+        for label, value in cards
+    )
+
+
+def build_report(dashboard, workers=None):
+    """Construit le rapport HTML complet, chaque vue étant construite et rendue en parallèle"""
+    tasks = [(builder, name) for builder, _, names in REPORT_SECTIONS for name in names]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(worker_dashboard(dashboard),)) as executor:
+        rendered_views = iter(list(executor.map(render_section_view, *zip(*tasks))))
+    rendered = [[next(rendered_views) for _ in names] for _, _, names in REPORT_SECTIONS]
+
+    body = [
+        '<h1 class="main-header">💎 Analyse des Plateformes de Contenu Adulte</h1>',
+        f'<p>Rapport généré le {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}</p>',
+        '<h3 class="section-header">📊 VUE D\'ENSEMBLE DU MARCHÉ</h3>',
+        f'<div class="report-grid">{render_overview(dashboard)}</div>',
+    ]
+    for (_, title, _), fragments in zip(REPORT_SECTIONS, rendered):
+        body.append(f'<h3 class="section-header">{html.escape(title)}</h3>')
+        body.append('<div class="report-grid">')
+        body.extend(f'<div class="report-view">{fragment}</div>' for fragment in fragments)
+        body.append('</div>')
+
+    return f"""<!DOCTYPE html>
+<html lang="fr">
+<head>
+<meta charset="utf-8">
+<title>Analyse des Plateformes de Contenu Adulte - Rapport</title>
+<script type="text/javascript">{get_plotlyjs()}</script>
+{PAGE_CSS}
+<style>
+    body {{ font-family: sans-serif; margin: 2rem; }}
+    .report-grid {{ display: grid; grid-template-columns: repeat(2, minmax(0, 1fr)); gap: 1rem; }}
+    .report-view {{ min-width: 0; overflow-x: auto; }}
+    .report-table {{ border-collapse: collapse; font-size: 0.85rem; }}
+    .report-table th, .report-table td {{ padding: 0.3rem 0.6rem; border-bottom: 1px solid #ddd; }}
+</style>
+</head>
+<body>
+{chr(10).join(body)}
+</body>
+</html>
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exporte toutes les vues du dashboard en un rapport HTML autonome")
+    parser.add_argument('--output', '-o', default='rapport_plateformes.html',
+                        help="Fichier HTML de sortie")
+    parser.add_argument('--workers', '-w', type=int, default=os.cpu_count(),
+                        help="Nombre de processus de génération des données et des graphiques")
+    parser.add_argument('--seed', type=int, default=None,
+                        help="Graine aléatoire racine (rapport reproductible)")
+    parser.add_argument('--reference-date', default=None,
+                        help="Date de référence des données (AAAA-MM-JJ, aujourd'hui par défaut)")
+    parser.add_argument('--creators', type=int, default=100,
+                        help="Nombre de créateurs simulés")
+    parser.add_argument('--platforms-file', default=None,
+                        help="Définitions des plateformes (JSON ou CSV)")
+    parser.add_argument('--creators-dir', default=None,
+                        help="Dossier de morceaux de créateurs (mode hors mémoire)")
+    parser.add_argument('--market-freq', default='M', choices=['H', 'D', 'W', 'M'],
+                        help="Granularité des séries de marché")
+    args = parser.parse_args()
+
+    dashboard = AdultPlatformsDashboard(seed=args.seed, n_creators=args.creators,
+                                        workers=args.workers, market_freq=args.market_freq,
+                                        platforms_file=args.platforms_file, creators_dir=args.creators_dir,
+                                        reference_date=args.reference_date)
+    report = build_report(dashboard, workers=args.workers)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        f.write(report)
+    print(f"Rapport exporté dans {args.output} (graine {dashboard.streams.seed}, "
+          f"date de référence {dashboard.reference_time:%Y-%m-%d})")
+
+
+if __name__ == "__main__":
+    main()
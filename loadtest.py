@@ -0,0 +1,360 @@
+# loadtest.py
+"""Banc de charge multi-sessions du dashboard, entièrement hors ligne.
+
+Le banc démarre un serveur ``streamlit run Dashboard.py`` sans interface,
+n'écoutant que sur la boucle locale (127.0.0.1), et lui connecte N sessions
+par le même websocket que le navigateur (``/_stcore/stream``). Toutes les
+sessions partagent donc un seul processus serveur, ses caches et ses threads
+d'exécution : les chiffres sont ceux de la capacité d'un serveur.
+
+Chaque session simulée enchaîne des interactions réalistes : rafraîchissements
+automatiques, filtres de la sidebar, slider des revenus, bouton de
+rafraîchissement et changements d'onglet. Les onglets sont gérés par le
+navigateur sans réexécution du script : un changement d'onglet est compté
+comme une interaction côté client, sans message envoyé au serveur.
+
+Pour chaque nombre de sessions N, un serveur neuf est démarré et chauffé par
+une première session (imports, données, caches) ; le banc mesure ensuite les
+latences de réexécution (P50/P95/P99, de l'envoi de l'état des widgets à la
+fin du script), le débit et la mémoire résidente du serveur, ainsi que la
+mémoire ajoutée par session depuis la fin du chauffage.
+
+Usage :
+
+    python loadtest.py --sessions 1 2 4 8 --interactions 20
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+import numpy as np
+from websockets.asyncio.client import connect
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+from random_streams import RandomStreams
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Dashboard.py')
+HOST = '127.0.0.1'
+
+# Interactions simulées et leur fréquence relative
+INTERACTIONS = {
+    'auto_refresh': 0.30,
+    'tab': 0.25,
+    'platforms': 0.15,
+    'categories': 0.10,
+    'earnings': 0.15,
+    'refresh_button': 0.05
+}
+
+# Clés des widgets du dashboard pilotés par le banc
+WIDGET_KEYS = ('selected_platforms', 'selected_categories', 'earnings_range', 'refresh_data')
+
+
+def free_port():
+    """Port TCP libre sur la boucle locale"""
+    with socket.socket() as sock:
+        sock.bind((HOST, 0))
+        return sock.getsockname()[1]
+
+
+def resident_memory_bytes(pid):
+    """Mémoire résidente actuelle d'un processus (Linux, via /proc)"""
+    with open(f'/proc/{pid}/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+
+class DashboardServer:
+    """Serveur Streamlit local du dashboard, sans navigateur ni accès réseau extérieur"""
+
+    def __init__(self, seed, timeout):
+        self.port = free_port()
+        self.timeout = timeout
+        env = dict(os.environ,
+                   # Pas de time.sleep(30) + st.rerun() côté serveur : les ticks
+                   # de rafraîchissement automatique sont rejoués par le banc
+                   DASHBOARD_AUTO_REFRESH='0',
+                   DASHBOARD_SEED=os.environ.get('DASHBOARD_SEED', str(seed)),
+                   STREAMLIT_LOGGER_LEVEL='error')
+        # Journal d'erreurs du serveur dans un fichier : un tube plein bloquerait le serveur
+        self.log = tempfile.TemporaryFile()
+        self.process = subprocess.Popen(
+            [sys.executable, '-m', 'streamlit', 'run', APP_PATH,
+             '--server.headless', 'true',
+             '--server.address', HOST,
+             '--server.port', str(self.port),
+             '--server.fileWatcherType', 'none',
+             '--browser.gatherUsageStats', 'false'],
+            cwd=os.path.dirname(APP_PATH), env=env,
+            stdout=subprocess.DEVNULL, stderr=self.log
+        )
+        self.url = f'ws://{HOST}:{self.port}/_stcore/stream'
+
+    def wait_ready(self):
+        """Attend que le serveur réponde sur /_stcore/health"""
+        deadline = time.monotonic() + self.timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                self.log.seek(0)
+                raise RuntimeError(f"Le serveur Streamlit s'est arrêté: {self.log.read().decode()}")
+            try:
+                with urllib.request.urlopen(f'http://{HOST}:{self.port}/_stcore/health', timeout=1) as response:
+                    if response.status == 200:
+                        return
+            except OSError:
+                pass
+            time.sleep(0.2)
+        raise TimeoutError("Le serveur Streamlit n'a pas démarré à temps")
+
+    def rss(self):
+        return resident_memory_bytes(self.process.pid)
+
+    def stop(self):
+        self.process.terminate()
+        try:
+            self.process.wait(10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        self.log.close()
+
+    def __enter__(self):
+        try:
+            self.wait_ready()
+        except Exception:
+            self.stop()
+            raise
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class SimulatedSession:
+    """Session d'analyste rejouant des interactions aléatoires reproductibles sur le websocket"""
+
+    def __init__(self, rng, url, timeout):
+        self.rng = rng
+        self.url = url
+        self.timeout = timeout
+        self.websocket = None
+        # État courant des widgets, renvoyé en entier à chaque réexécution
+        # comme le fait le navigateur
+        self.states = {}
+        self.widgets = {}
+
+    async def __aenter__(self):
+        self.websocket = await connect(self.url, subprotocols=['streamlit'], max_size=None,
+                                       open_timeout=self.timeout)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.websocket.close()
+
+    def _track(self, element):
+        """Enregistre un widget du dashboard et son état par défaut"""
+        kind = element.WhichOneof('type')
+        if kind not in ('multiselect', 'slider', 'checkbox', 'button'):
+            return
+        proto = getattr(element, kind)
+        key = next((key for key in WIDGET_KEYS if proto.id.endswith(key)), None)
+        if key:
+            self.widgets[key] = proto
+        if proto.id in self.states or kind == 'button':
+            return
+
+        state = self.states.setdefault(proto.id, {'id': proto.id})
+        if kind == 'multiselect':
+            state['string_array_value'] = {'data': [proto.options[i] for i in proto.default]}
+        elif kind == 'slider':
+            state['double_array_value'] = {'data': list(proto.value if proto.set_value else proto.default)}
+        else:
+            state['bool_value'] = proto.value if proto.set_value else proto.default
+
+    def _set(self, key, **value):
+        widget_id = self.widgets[key].id
+        self.states[widget_id] = {'id': widget_id, **value}
+
+    def _pick(self, options):
+        count = self.rng.integers(1, len(options) + 1)
+        return [str(option) for option in self.rng.choice(options, size=count, replace=False)]
+
+    async def _rerun(self, trigger=None):
+        """Envoie l'état des widgets et attend la fin du script ; retourne la latence"""
+        message = BackMsg()
+        # Premier affichage sans widget connu : le message doit tout de même
+        # porter une demande de réexécution
+        message.rerun_script.widget_states.SetInParent()
+        states = message.rerun_script.widget_states.widgets
+        for state in self.states.values():
+            states.add(**state)
+        if trigger:
+            states.add(id=self.widgets[trigger].id, trigger_value=True)
+
+        start = time.perf_counter()
+        await self.websocket.send(message.SerializeToString())
+        async with asyncio.timeout(self.timeout):
+            async for data in self.websocket:
+                forward = ForwardMsg()
+                forward.ParseFromString(data)
+                kind = forward.WhichOneof('type')
+                if kind == 'delta' and forward.delta.WhichOneof('type') == 'new_element':
+                    element = forward.delta.new_element
+                    if element.WhichOneof('type') == 'exception':
+                        raise RuntimeError(f"Erreur dans le dashboard: {element.exception.message}")
+                    self._track(element)
+                elif kind == 'script_finished':
+                    # Le bouton de rafraîchissement relance le script (st.rerun) :
+                    # seule la fin de la dernière exécution compte
+                    if forward.script_finished == ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+                        raise RuntimeError("Erreur de compilation du dashboard")
+                    if forward.script_finished == ForwardMsg.FINISHED_SUCCESSFULLY:
+                        return time.perf_counter() - start
+        raise RuntimeError("Connexion fermée par le serveur")
+
+    async def load(self):
+        """Premier affichage de la page, retourne la latence"""
+        return await self._rerun()
+
+    async def interact(self):
+        """Joue une interaction ; retourne (type, latence) ou (type, None) sans réexécution"""
+        kind = self.rng.choice(list(INTERACTIONS), p=list(INTERACTIONS.values()))
+
+        # Les onglets sont gérés côté navigateur : changement d'onglet sans
+        # message au serveur ni réexécution du script
+        if kind == 'tab':
+            return kind, None
+
+        if kind in ('platforms', 'categories'):
+            key = f'selected_{kind}'
+            self._set(key, string_array_value={'data': self._pick(self.widgets[key].options)})
+        elif kind == 'earnings':
+            widget = self.widgets['earnings_range']
+            low, high = sorted(self.rng.uniform(widget.min, widget.max, size=2))
+            self._set('earnings_range', double_array_value={'data': [int(low), int(high)]})
+
+        return kind, await self._rerun(trigger='refresh_data' if kind == 'refresh_button' else None)
+
+
+async def run_session(session, interactions, think_time, barrier):
+    """Une session : ouverture de la page, puis interactions en même temps que les autres"""
+    async with session:
+        load = await session.load()
+
+        # Toutes les sessions commencent leurs interactions ensemble
+        await barrier.wait()
+        latencies = []
+        tab_switches = 0
+        start = time.monotonic()
+        for _ in range(interactions):
+            kind, latency = await session.interact()
+            if latency is None:
+                tab_switches += 1
+            else:
+                latencies.append(latency)
+            if think_time:
+                await asyncio.sleep(think_time)
+        return {
+            'load': load,
+            'latencies': latencies,
+            'tab_switches': tab_switches,
+            'start': start,
+            'stop': time.monotonic()
+        }
+
+
+async def drive_sessions(url, n_sessions, interactions, streams, timeout, think_time):
+    """Connecte N sessions au serveur et les fait interagir en parallèle"""
+    barrier = asyncio.Barrier(n_sessions)
+    sessions = [SimulatedSession(streams.generator(i), url, timeout) for i in range(n_sessions)]
+    return await asyncio.gather(*(run_session(session, interactions, think_time, barrier)
+                                  for session in sessions))
+
+
+async def warm_up(url, timeout):
+    """Première ouverture de la page : imports, données et caches du serveur"""
+    async with SimulatedSession(None, url, timeout) as session:
+        await session.load()
+
+
+def run_level(n_sessions, interactions, streams, seed, timeout=120, think_time=0.0):
+    """Mesure N sessions concurrentes sur un serveur neuf, effectuant chacune `interactions` interactions"""
+    level_streams = streams.child(n_sessions)
+    with DashboardServer(seed, timeout) as server:
+        asyncio.run(warm_up(server.url, timeout))
+        baseline = server.rss()
+        sessions = asyncio.run(drive_sessions(server.url, n_sessions, interactions, level_streams,
+                                              timeout, think_time))
+        resident = server.rss()
+
+    elapsed = max(session['stop'] for session in sessions) - min(session['start'] for session in sessions)
+    reruns = np.array([latency for session in sessions for latency in session['latencies']])
+    return {
+        'sessions': n_sessions,
+        'reruns': len(reruns),
+        'tab_switches': sum(session['tab_switches'] for session in sessions),
+        'p50_ms': float(np.percentile(reruns, 50) * 1000) if len(reruns) else None,
+        'p95_ms': float(np.percentile(reruns, 95) * 1000) if len(reruns) else None,
+        'p99_ms': float(np.percentile(reruns, 99) * 1000) if len(reruns) else None,
+        'load_p50_ms': float(np.median([session['load'] for session in sessions]) * 1000),
+        'throughput_per_s': len(reruns) / elapsed if elapsed else None,
+        'server_rss_mb': resident / 2**20,
+        'rss_per_session_mb': (resident - baseline) / n_sessions / 2**20
+    }
+
+
+TABLE_HEADER = (f"{'N':>4} {'reruns':>7} {'onglets':>8} {'P50 ms':>8} {'P95 ms':>8} {'P99 ms':>8} "
+                f"{'reruns/s':>9} {'RSS Mo':>7} {'Mo/session':>11}")
+
+
+def format_row(result):
+    """Met en forme le résultat d'un palier sur une ligne du tableau"""
+    return (
+        f"{result['sessions']:>4} {result['reruns']:>7} {result['tab_switches']:>8} "
+        f"{result['p50_ms'] or 0:>8.0f} {result['p95_ms'] or 0:>8.0f} {result['p99_ms'] or 0:>8.0f} "
+        f"{result['throughput_per_s'] or 0:>9.2f} {result['server_rss_mb']:>7.0f} "
+        f"{result['rss_per_session_mb']:>11.1f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Banc de charge multi-sessions du dashboard (hors ligne)")
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 2, 4, 8],
+                        help="Nombres de sessions concurrentes à tester")
+    parser.add_argument('--interactions', type=int, default=20,
+                        help="Interactions par session")
+    parser.add_argument('--think-time', type=float, default=0.0,
+                        help="Pause entre deux interactions d'une session (secondes)")
+    parser.add_argument('--timeout', type=float, default=120,
+                        help="Durée maximale d'une réexécution ou du démarrage du serveur (secondes)")
+    parser.add_argument('--seed', type=int, default=0,
+                        help="Graine des interactions et des données du dashboard")
+    parser.add_argument('--json', default=None,
+                        help="Fichier de sortie JSON des résultats")
+    args = parser.parse_args()
+
+    streams = RandomStreams(args.seed).child('loadtest')
+
+    print(TABLE_HEADER)
+    print('-' * len(TABLE_HEADER), flush=True)
+    results = []
+    for n_sessions in args.sessions:
+        results.append(run_level(n_sessions, args.interactions, streams, args.seed,
+                                 args.timeout, args.think_time))
+        print(format_row(results[-1]), flush=True)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# platform_registry.py
+"""Registre des plateformes sous forme de tableaux alignés.
+
+Chaque plateforme reçoit un code entier (sa position dans le registre) ; les
+attributs sont stockés dans des tableaux numpy indexés par ce code, si bien
+que les totaux, les palettes de couleurs et les jointures avec les données
+des créateurs (colonne ``platform_code``) sont des opérations vectorisées.
+"""
+import colorsys
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+# Attributs numériques et textuels d'une plateforme
+NUMERIC_FIELDS = ['founded', 'fees', 'monthly_users', 'creators_count', 'avg_creator_earnings']
+TEXT_FIELDS = ['content_type']
+
+# Angle d'or : des teintes successives restent bien séparées quel que soit le nombre de plateformes
+GOLDEN_RATIO_CONJUGATE = 0.618033988749895
+
+
+def generate_color(code):
+    """Génère une couleur hexadécimale distincte et stable pour un code de plateforme"""
+    hue = (code * GOLDEN_RATIO_CONJUGATE) % 1.0
+    red, green, blue = colorsys.hls_to_rgb(hue, 0.55, 0.75)
+    return '#{:02X}{:02X}{:02X}'.format(round(red * 255), round(green * 255), round(blue * 255))
+
+
+class PlatformRegistry:
+    """Attributs des plateformes stockés en tableaux alignés sur les codes entiers"""
+
+    def __init__(self, records):
+        records = list(records)
+        if not records:
+            raise ValueError("Le registre des plateformes est vide")
+
+        # Champs obligatoires : absents ou vides (cellule CSV vide, null JSON) sont refusés
+        for position, record in enumerate(records):
+            missing = [field for field in ['name'] + NUMERIC_FIELDS if record.get(field) is None]
+            if missing:
+                label = record.get('name') or f"n°{position + 1}"
+                raise ValueError(f"Plateforme {label}: champs obligatoires manquants: {', '.join(missing)}")
+
+        self.names = np.array([record['name'] for record in records], dtype=object)
+        if len(set(self.names)) != len(self.names):
+            raise ValueError("Noms de plateformes en double dans le registre")
+        self.codes = np.arange(len(records))
+        self._index = pd.Index(self.names)
+
+        for field in NUMERIC_FIELDS:
+            setattr(self, field, np.array([record[field] for record in records], dtype=float))
+        for field in TEXT_FIELDS:
+            setattr(self, field, np.array([record.get(field) or 'Mixed' for record in records], dtype=object))
+
+        # Couleurs manquantes générées automatiquement
+        self.colors = np.array([
+            record.get('color') or generate_color(code)
+            for code, record in zip(self.codes, records)
+        ], dtype=object)
+
+    @classmethod
+    def from_dict(cls, platforms):
+        """Construit le registre à partir d'un dictionnaire {nom: attributs}"""
+        return cls({'name': name, **info} for name, info in platforms.items())
+
+    @classmethod
+    def from_file(cls, path):
+        """Charge les définitions depuis un fichier JSON ({nom: attributs} ou liste) ou CSV"""
+        extension = os.path.splitext(path)[1].lower()
+        if extension == '.json':
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+            return cls.from_dict(data) if isinstance(data, dict) else cls(data)
+        if extension == '.csv':
+            df = pd.read_csv(path)
+            df = df.astype(object).where(df.notna(), None)
+            return cls(df.to_dict('records'))
+        raise ValueError(f"Format de fichier de plateformes non supporté: {path}")
+
+    def __len__(self):
+        return len(self.names)
+
+    def code(self, names):
+        """Retourne les codes entiers d'un ou plusieurs noms de plateformes"""
+        codes = self._index.get_indexer(np.atleast_1d(np.asarray(names, dtype=object)))
+        if (codes < 0).any():
+            raise KeyError(f"Plateforme inconnue: {np.atleast_1d(names)[codes < 0][0]}")
+        return codes if np.ndim(names) else codes[0]
+
+    def categorical(self, codes):
+        """Convertit des codes en colonne catégorielle de noms partageant ces codes"""
+        return pd.Categorical.from_codes(codes, categories=self.names)
+
+    def color_map(self):
+        """Palette {nom: couleur} pour les graphiques"""
+        return dict(zip(self.names, self.colors))
+
+    def frame(self):
+        """Attributs sous forme de DataFrame indexé par code, pour les jointures"""
+        return pd.DataFrame({
+            'platform': self.names,
+            'color': self.colors,
+            **{field: getattr(self, field) for field in NUMERIC_FIELDS + TEXT_FIELDS}
+        }, index=pd.Index(self.codes, name='platform_code'))
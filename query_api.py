@@ -0,0 +1,362 @@
+# query_api.py
+"""Service HTTP/JSON local exposant les agrégats du dashboard, sans interface.
+
+Les requêtes (parts de marché, revenus par plateforme, moyennes par
+catégorie et par pays, top des créateurs) sont calculées sur les données et
+les agrégations d'``AdultPlatformsDashboard``. Chaque réponse est mise en
+cache sous la clé (version des données interrogées, requête, paramètres
+normalisés) et porte un ETag calculé sur son seul contenu : un client qui
+renvoie ``If-None-Match`` reçoit un 304 sans corps tant que le résultat ne
+change pas. Des clients concurrents demandant la même requête partagent un
+seul calcul. Les données de marché ne dépendent que de la graine et de la
+date de référence ; celles des créateurs changent aussi à chaque mise à
+jour live. La version est renvoyée dans l'en-tête ``X-Data-Version``.
+
+Usage :
+
+    python query_api.py --port 8765 --seed 42 --refresh-interval 30
+    curl http://127.0.0.1:8765/market_share?platforms=OnlyFans,Fansly
+"""
+import argparse
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pandas as pd
+
+from Dashboard import AdultPlatformsDashboard
+
+
+def _records(df):
+    """Convertit un DataFrame en liste de dictionnaires JSON (NaN -> null, dates ISO)"""
+    return json.loads(df.to_json(orient='records', date_format='iso'))
+
+
+def _platform_filter(dashboard, platforms):
+    """Codes des plateformes demandées (toutes si le paramètre est absent)"""
+    if not platforms:
+        return dashboard.platforms.codes
+    return dashboard.platforms.code(platforms.split(','))
+
+
+def _limit(value, default, maximum):
+    limit = default if value is None else int(value)
+    if not 1 <= limit <= maximum:
+        raise ValueError(f"limit doit être compris entre 1 et {maximum}")
+    return limit
+
+
+def query_market_share(dashboard, date=None, platforms=None):
+    """Parts de marché du mois le plus récent (ou du dernier mois avant date)"""
+    market = dashboard.market_data
+    dates = market['date']
+    target = dates.max() if date is None else dates[dates <= pd.Timestamp(date)].max()
+    if pd.isna(target):
+        raise ValueError(f"Aucune donnée de marché avant {date}")
+
+    snapshot = market[dates == target].set_index('platform_code')
+    snapshot = snapshot.loc[_platform_filter(dashboard, platforms)]
+    return {
+        'date': target.isoformat(),
+        'platforms': _records(snapshot[['platform', 'market_share', 'revenue_millions']])
+    }
+
+
+def query_revenue(dashboard, start=None, end=None, platforms=None):
+    """Revenus par plateforme, sommés sur [start, end] (dernier mois par défaut)"""
+    store = dashboard.market_store
+    if start is None and end is None:
+        start = end = store.frame('M')['date'].max()
+    monthly = store.frame('M', start, end)
+    if monthly.empty:
+        raise ValueError("Aucune donnée de marché sur la période demandée")
+
+    revenue = monthly.groupby('platform_code')['revenue_millions'].sum()
+    codes = _platform_filter(dashboard, platforms)
+    return {
+        'start': monthly['date'].min().isoformat(),
+        'end': monthly['date'].max().isoformat(),
+        'platforms': _records(pd.DataFrame({
+            'platform': dashboard.platforms.names[codes],
+            'revenue_millions': revenue.reindex(codes).to_numpy()
+        }))
+    }
+
+
+def query_categories(dashboard):
+    """Revenu moyen et effectif par catégorie de contenu"""
+    return {'categories': _records(dashboard.creator_aggregates()['category'].reset_index())}
+
+
+def query_countries(dashboard):
+    """Revenu moyen et effectif par pays"""
+    return {'countries': _records(dashboard.creator_aggregates()['country'].reset_index())}
+
+
+def query_top_earners(dashboard, limit=None):
+    """Créateurs les mieux payés (au plus le top calculé par les agrégations)"""
+    top = dashboard.creator_aggregates()['top_earners']
+    top = top.head(_limit(limit, len(top), len(top))).assign(
+        platform=lambda df: dashboard.platforms.names[df['platform_code'].to_numpy()]
+    )
+    return {'top_earners': _records(top[['username', 'platform', 'monthly_earnings']])}
+
+
+# Requêtes exposées : chemin -> (fonction, paramètres acceptés, données interrogées)
+QUERIES = {
+    'market_share': (query_market_share, ('date', 'platforms'), 'market'),
+    'revenue': (query_revenue, ('start', 'end', 'platforms'), 'market'),
+    'categories': (query_categories, (), 'creators'),
+    'countries': (query_countries, (), 'creators'),
+    'top_earners': (query_top_earners, ('limit',), 'creators'),
+}
+
+
+class QueryError(Exception):
+    """Requête invalide, associée à un code HTTP"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class QueryService:
+    """Exécute les requêtes et met en cache les réponses par version des données"""
+
+    def __init__(self, dashboard, cache_size=256):
+        self.dashboard = dashboard
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        # Verrou du cache et verrous par clé en cours de calcul
+        self._lock = threading.Lock()
+        self._inflight = {}
+        # Les calculs et les mises à jour live ne se chevauchent pas
+        self._data_lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    def data_version(self, data):
+        """Version des données 'market' (graine, date de référence) ou 'creators' (+ mise à jour live)"""
+        dashboard = self.dashboard
+        version = f"{dashboard.streams.seed}-{dashboard.reference_time:%Y%m%d}"
+        return version if data == 'market' else f"{version}-{dashboard.live_tick}"
+
+    @staticmethod
+    def normalize(name, params):
+        """Valide les paramètres et les met sous forme canonique pour la clé de cache"""
+        if name not in QUERIES:
+            raise QueryError(404, f"Requête inconnue: {name}")
+        accepted = QUERIES[name][1]
+        unknown = sorted(set(params) - set(accepted))
+        if unknown:
+            raise QueryError(400, f"Paramètres non acceptés par {name}: {', '.join(unknown)}")
+
+        # Les plateformes sont répondues dans l'ordre demandé : seuls les doublons sont retirés
+        params = dict(params)
+        if params.get('platforms'):
+            params['platforms'] = ','.join(dict.fromkeys(params['platforms'].split(',')))
+        return tuple(sorted(params.items()))
+
+    def _compute(self, name, params):
+        """Calcule une réponse ; retourne (clé de cache, (ETag, corps JSON, version))"""
+        function, _, data = QUERIES[name]
+        with self._data_lock:
+            version = self.data_version(data)
+            try:
+                payload = function(self.dashboard, **dict(params))
+            except (KeyError, ValueError) as exc:
+                raise QueryError(400, str(exc.args[0] if exc.args else exc))
+
+        # ETag du seul contenu : un résultat inchangé garde son ETag d'une version à l'autre
+        body = json.dumps({'query': name, **payload}, ensure_ascii=False).encode('utf-8')
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        return (version, name, params), (etag, body, version)
+
+    def get(self, name, params):
+        """Retourne (ETag, corps JSON, version des données) d'une requête, depuis le cache si possible"""
+        params = self.normalize(name, params)
+        key = (self.data_version(QUERIES[name][2]), name, params)
+
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return self._cache[key]
+            key_lock = self._inflight.setdefault(key, threading.Lock())
+
+        # Un seul calcul par clé : les autres clients attendent son résultat
+        with key_lock:
+            with self._lock:
+                if key in self._cache:
+                    self.hits += 1
+                    return self._cache[key]
+            try:
+                stored_key, entry = self._compute(name, params)
+            except Exception:
+                with self._lock:
+                    self._inflight.pop(key, None)
+                raise
+
+            with self._lock:
+                self._inflight.pop(key, None)
+                self.misses += 1
+                # Clé de la version réellement calculée (une mise à jour a pu intervenir)
+                self._cache[stored_key] = entry
+                self._cache.move_to_end(stored_key)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return entry
+
+    def refresh(self, workers=1):
+        """Applique une mise à jour live et purge les réponses dont les données ont changé"""
+        with self._data_lock:
+            self.dashboard.update_live_data(workers)
+            versions = {data: self.data_version(data) for data in ('market', 'creators')}
+        with self._lock:
+            for key in [key for key in self._cache if key[0] != versions[QUERIES[key[1]][2]]]:
+                del self._cache[key]
+
+    def stats(self):
+        """État du service (version, taille et efficacité du cache)"""
+        with self._lock:
+            return {
+                'versions': {data: self.data_version(data) for data in ('market', 'creators')},
+                'queries': sorted(QUERIES),
+                'cache_entries': len(self._cache),
+                'cache_hits': self.hits,
+                'cache_misses': self.misses
+            }
+
+
+def _etag_matches(header, etag):
+    """Compare l'en-tête If-None-Match à un ETag (comparaison faible)"""
+    if header is None:
+        return False
+    candidates = [candidate.strip() for candidate in header.split(',')]
+    return '*' in candidates or etag in [candidate.removeprefix('W/') for candidate in candidates]
+
+
+class QueryRequestHandler(BaseHTTPRequestHandler):
+    """Traduit les requêtes HTTP GET en appels au QueryService du serveur"""
+
+    server_version = 'PlatformsQueryAPI/1.0'
+    protocol_version = 'HTTP/1.1'
+
+    def _send(self, status, body=b'', etag=None, version=None):
+        self.send_response(status)
+        if version:
+            self.send_header('X-Data-Version', version)
+        if etag:
+            self.send_header('ETag', etag)
+            # Le client peut garder la réponse mais doit la revalider
+            self.send_header('Cache-Control', 'no-cache')
+        if status != 304:
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if status != 304:
+            self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        name = url.path.strip('/')
+        service = self.server.service
+
+        if name == '':
+            body = json.dumps(service.stats()).encode('utf-8')
+            self._send(200, body)
+            return
+
+        try:
+            params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            etag, body, version = service.get(name, params)
+        except QueryError as exc:
+            self._send(exc.status, json.dumps({'error': str(exc)}, ensure_ascii=False).encode('utf-8'))
+            return
+
+        if _etag_matches(self.headers.get('If-None-Match'), etag):
+            self._send(304, etag=etag, version=version)
+        else:
+            self._send(200, body, etag, version)
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+def create_server(service, host='127.0.0.1', port=8765, quiet=False):
+    """Crée le serveur HTTP multi-thread (un thread par connexion)"""
+    server = ThreadingHTTPServer((host, port), QueryRequestHandler)
+    server.daemon_threads = True
+    server.service = service
+    server.quiet = quiet
+    return server
+
+
+def start_refresh_thread(service, interval, workers=1):
+    """Lance les mises à jour live périodiques en arrière-plan"""
+    stop = threading.Event()
+
+    def loop():
+        while not stop.wait(interval):
+            service.refresh(workers)
+
+    threading.Thread(target=loop, daemon=True).start()
+    return stop
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Service HTTP/JSON des agrégats du dashboard")
+    parser.add_argument('--host', default='127.0.0.1',
+                        help="Adresse d'écoute")
+    parser.add_argument('--port', '-p', type=int, default=8765,
+                        help="Port d'écoute")
+    parser.add_argument('--workers', '-w', type=int, default=os.cpu_count(),
+                        help="Nombre de processus de génération et d'agrégation des données")
+    parser.add_argument('--seed', type=int, default=None,
+                        help="Graine aléatoire racine (réponses reproductibles)")
+    parser.add_argument('--reference-date', default=None,
+                        help="Date de référence des données (AAAA-MM-JJ, aujourd'hui par défaut)")
+    parser.add_argument('--creators', type=int, default=100,
+                        help="Nombre de créateurs simulés")
+    parser.add_argument('--platforms-file', default=None,
+                        help="Définitions des plateformes (JSON ou CSV)")
+    parser.add_argument('--creators-dir', default=None,
+                        help="Dossier de morceaux de créateurs (mode hors mémoire)")
+    parser.add_argument('--market-freq', default='M', choices=['H', 'D', 'W', 'M'],
+                        help="Granularité des séries de marché")
+    parser.add_argument('--refresh-interval', type=float, default=0,
+                        help="Intervalle des mises à jour live en secondes (0 : données figées)")
+    parser.add_argument('--cache-size', type=int, default=256,
+                        help="Nombre maximal de réponses en cache")
+    parser.add_argument('--quiet', '-q', action='store_true',
+                        help="Ne journalise pas chaque requête")
+    args = parser.parse_args()
+
+    dashboard = AdultPlatformsDashboard(seed=args.seed, n_creators=args.creators,
+                                        workers=args.workers, market_freq=args.market_freq,
+                                        platforms_file=args.platforms_file, creators_dir=args.creators_dir,
+                                        reference_date=args.reference_date)
+    service = QueryService(dashboard, cache_size=args.cache_size)
+    # Agrégats des créateurs calculés avant d'accepter des clients
+    dashboard.creator_aggregates()
+    if args.refresh_interval > 0:
+        start_refresh_thread(service, args.refresh_interval, args.workers)
+
+    server = create_server(service, args.host, args.port, args.quiet)
+    print(f"Service des requêtes sur http://{args.host}:{args.port}/ "
+          f"(graine {dashboard.streams.seed}, date de référence {dashboard.reference_time:%Y-%m-%d})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+# random_streams.py
+"""Flux aléatoires reproductibles et indépendants, dérivés d'une graine racine.
+
+Chaque composant (génération des créateurs, données de marché, mises à jour
+live, projections, risques...) obtient son propre générateur, identifié par
+un chemin hiérarchique, par exemple ``('creators', 3)`` pour le bloc 3 des
+créateurs. Le flux ne dépend que de la graine racine et du chemin : un
+calcul découpé en blocs répartis sur plusieurs processus produit donc
+exactement les mêmes valeurs qu'un calcul dans un seul processus.
+"""
+import zlib
+
+import numpy as np
+
+
+class RandomStreams:
+    """Arbre de générateurs numpy dérivés d'une même graine racine"""
+
+    def __init__(self, seed=None, path=()):
+        # Sans graine, on en tire une et on la conserve pour pouvoir rejouer l'exécution
+        self.seed = np.random.SeedSequence(seed).entropy if seed is None else int(seed)
+        self.path = tuple(path)
+
+    @staticmethod
+    def _spawn_key(path):
+        """Convertit un chemin (noms et indices) en clé de dérivation entière"""
+        key = []
+        for part in path:
+            if isinstance(part, (int, np.integer)):
+                if part < 0:
+                    raise ValueError(f"Indice de flux négatif: {part}")
+                key.append(int(part))
+            else:
+                key.append(zlib.crc32(str(part).encode('utf-8')))
+        return tuple(key)
+
+    def child(self, *path):
+        """Retourne le sous-arbre de flux situé sous ``path``"""
+        return RandomStreams(self.seed, self.path + path)
+
+    def generator(self, *path):
+        """Retourne le générateur indépendant associé à ``path``"""
+        seed_sequence = np.random.SeedSequence(self.seed, spawn_key=self._spawn_key(self.path + path))
+        return np.random.Generator(np.random.PCG64(seed_sequence))
+
+    def __repr__(self):
+        return f"RandomStreams(seed={self.seed}, path={self.path})"
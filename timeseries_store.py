@@ -0,0 +1,160 @@
+# timeseries_store.py
+"""Stockage de séries temporelles multi-résolution pour les données de marché.
+
+Les séries sont conservées sous forme de tableaux numpy alignés sur un index
+datetime64 trié : une plage de dates se résout par deux recherches
+dichotomiques (``np.searchsorted``) au lieu d'un masque booléen sur toute
+l'historique. Des agrégats plus grossiers (jour, semaine, mois) sont
+précalculés à la construction, et ``select`` choisit automatiquement la
+granularité la plus fine dont le nombre de points tient dans la largeur du
+graphique.
+"""
+import numpy as np
+import pandas as pd
+
+# Granularités de la plus fine à la plus grossière
+LEVELS = ['H', 'D', 'W', 'M']
+LEVEL_LABELS = {'H': 'heure', 'D': 'jour', 'W': 'semaine', 'M': 'mois'}
+
+# Alias pandas correspondants ('H' et 'M' sont dépréciés depuis pandas 2.2)
+PANDAS_FREQ = {'H': 'h', 'D': 'D', 'W': 'W', 'M': 'ME'}
+
+# Nombre moyen de points par mois pour chaque granularité de base
+PERIODS_PER_MONTH = {'H': 365.25 * 24 / 12, 'D': 365.25 / 12, 'W': 365.25 / 7 / 12, 'M': 1}
+
+# Nombre de périodes de base par jour pour les séries régulières
+PERIODS_PER_DAY = {'H': 24, 'D': 1}
+
+# Agrégation des métriques lors du passage à une granularité plus grossière :
+# les revenus s'additionnent, les effectifs sont des niveaux moyens
+AGGREGATIONS = {
+    'monthly_users': 'mean',
+    'creators_count': 'mean',
+    'revenue_millions': 'sum'
+}
+
+
+class TimeSeriesStore:
+    """Séries par plateforme indexées par un tableau datetime64 trié"""
+
+    def __init__(self, data, freq='M', time_column='date', entity_column='platform', entities=None):
+        if freq not in LEVELS:
+            raise ValueError(f"Granularité inconnue: {freq} (attendu: {', '.join(LEVELS)})")
+
+        self.freq = freq
+        self.time_column = time_column
+        self.entity_column = entity_column
+        # L'ordre des entités définit leurs codes entiers (colonne <entité>_code)
+        self.entities = list(pd.unique(data[entity_column]) if entities is None else entities)
+        self.metrics = [metric for metric in AGGREGATIONS if metric in data.columns]
+
+        wide = data.pivot(index=time_column, columns=entity_column, values=self.metrics).sort_index()
+        base = {metric: wide[metric][self.entities] for metric in self.metrics}
+
+        # Niveau de base puis agrégats précalculés
+        self.levels = {freq: self._to_arrays(base)}
+        for level in LEVELS[LEVELS.index(freq) + 1:]:
+            if freq == 'W':
+                rolled = {
+                    metric: self._weeks_to_months(frame, AGGREGATIONS[metric])
+                    for metric, frame in base.items()
+                }
+            else:
+                rolled = {
+                    metric: self._roll_up(frame, freq, level, AGGREGATIONS[metric])
+                    for metric, frame in base.items()
+                }
+            self.levels[level] = self._to_arrays(rolled)
+
+    @staticmethod
+    def _roll_up(frame, base, level, how):
+        """Agrège une série horaire ou journalière à une granularité plus grossière.
+
+        Seules les périodes entièrement couvertes par l'historique sont
+        conservées : une semaine ou un mois tronqué aux bords de l'historique
+        fausserait les cumuls (et les taux de croissance calculés dessus), et
+        son étiquette pourrait tomber après la fin des données.
+        """
+        buckets = frame.resample(PANDAS_FREQ[level])
+        rolled = buckets.agg(how)
+        if level == 'M':
+            days = rolled.index.days_in_month.to_numpy()
+        else:
+            days = 7 if level == 'W' else 1
+        return rolled[buckets.size().to_numpy() == days * PERIODS_PER_DAY[base]]
+
+    @classmethod
+    def _weeks_to_months(cls, frame, how):
+        """Agrège des semaines en mois en répartissant chaque semaine sur ses jours.
+
+        Les semaines ne s'emboîtent pas dans les mois : additionner les 4 ou 5
+        semaines étiquetées dans un mois donnerait des dents de scie. Chaque
+        semaine (étiquetée par son dernier jour) est donc étalée sur ses 7 jours
+        avant l'agrégation par mois.
+        """
+        days = frame.index.values[:, None] - np.arange(6, -1, -1) * np.timedelta64(1, 'D')
+        values = np.repeat(frame.to_numpy(dtype=float), 7, axis=0)
+        if how == 'sum':
+            values = values / 7
+        daily = pd.DataFrame(values, index=pd.DatetimeIndex(days.ravel()), columns=frame.columns)
+        return cls._roll_up(daily, 'D', 'M', how)
+
+    @staticmethod
+    def _to_arrays(frames):
+        """Convertit des DataFrames larges (date x plateforme) en tableaux alignés"""
+        index = next(iter(frames.values())).index
+        return {
+            'index': index.values.astype('datetime64[ns]'),
+            'values': {metric: frame.to_numpy(dtype=float) for metric, frame in frames.items()}
+        }
+
+    @property
+    def start(self):
+        return pd.Timestamp(self.levels[self.freq]['index'][0])
+
+    @property
+    def end(self):
+        return pd.Timestamp(self.levels[self.freq]['index'][-1])
+
+    def range_slice(self, level, start=None, end=None):
+        """Retourne la tranche d'index couvrant [start, end] en temps logarithmique"""
+        index = self.levels[level]['index']
+        lo = 0 if start is None else np.searchsorted(index, np.datetime64(pd.Timestamp(start), 'ns'), side='left')
+        hi = len(index) if end is None else np.searchsorted(index, np.datetime64(pd.Timestamp(end), 'ns'), side='right')
+        return slice(lo, hi)
+
+    def choose_level(self, start=None, end=None, width_px=800):
+        """Choisit la granularité la plus fine affichant au plus un point par pixel"""
+        for level in self.levels:
+            section = self.range_slice(level, start, end)
+            if section.stop - section.start <= width_px:
+                return level
+        return level
+
+    def frame(self, level=None, start=None, end=None):
+        """Retourne les données d'une granularité au format long (date, plateforme, métriques)"""
+        level = level or self.freq
+        section = self.range_slice(level, start, end)
+        index = self.levels[level]['index'][section]
+        values = {metric: array[section] for metric, array in self.levels[level]['values'].items()}
+        n_entities = len(self.entities)
+
+        df = pd.DataFrame({
+            self.time_column: np.repeat(index, n_entities),
+            self.entity_column: np.tile(np.array(self.entities, dtype=object), len(index)),
+            f'{self.entity_column}_code': np.tile(np.arange(n_entities), len(index)),
+            **{metric: array.ravel() for metric, array in values.items()}
+        })
+
+        # Part de marché recalculée à la granularité demandée
+        if 'revenue_millions' in values:
+            revenue = values['revenue_millions']
+            totals = revenue.sum(axis=1, keepdims=True)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                df['market_share'] = (revenue / totals * 100).ravel()
+        return df
+
+    def select(self, start=None, end=None, width_px=800):
+        """Retourne les données de la plage visible à la granularité adaptée au graphique"""
+        level = self.choose_level(start, end, width_px)
+        return self.frame(level, start, end), level